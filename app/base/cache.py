@@ -0,0 +1,82 @@
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.views.decorators.cache import cache_page
+
+
+def get_media_tag(imdb_id) -> str:
+    return f'media:{imdb_id}'
+
+
+def get_user_tag(user_id) -> str:
+    return f'user:{user_id}'
+
+
+def get_discussion_tag(discussion_id) -> str:
+    return f'discussion:{discussion_id}'
+
+
+def get_generation_key(name: str) -> str:
+    return f'generation:{name}'
+
+
+def get_generations(names) -> list:
+    """
+        Current generations of namespaces or tags,
+        a missing counter is seeded from the clock,
+        so it never repeats a generation used before eviction
+    """
+
+    keys = [get_generation_key(name) for name in names]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generations[key] = cache.get_or_set(key, time.time_ns, timeout=None)
+    return [generations[key] for key in keys]
+
+
+def increment_generations(names):
+    for name in names:
+        try:
+            cache.incr(get_generation_key(name))
+        except ValueError:
+            # no counter yet, the next read seeds a fresh one
+            pass
+
+
+def invalidate(*names):
+    """
+        Moves namespaces or tags to the next generation once
+        the transaction is committed, responses cached under the previous
+        one are never read again and expire by their own timeout
+    """
+
+    transaction.on_commit(lambda: increment_generations(names))
+
+
+def is_deleted_with(origin, model) -> bool:
+    """
+        Whether the origin of post_delete is an instance or a queryset of model,
+        rows removed by its cascade are purged by the signals of model itself
+    """
+
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+def versioned_cache_page(timeout: int, namespace: str, get_tags=None):
+    """
+        cache_page which key prefix holds generations of the namespace
+        and of tags returned by get_tags(request, *args, **kwargs),
+        so invalidate(namespace) or invalidate(tag) drops cached pages in O(1)
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            names = [namespace, *(get_tags(request, *args, **kwargs) if get_tags else ())]
+            key_prefix = '.'.join([namespace, *map(str, get_generations(names))])
+            return cache_page(timeout, key_prefix=key_prefix)(view_func)(request, *args, **kwargs)
+        return wrapper
+    return decorator
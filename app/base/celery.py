@@ -1,12 +1,45 @@
 import os
+from functools import wraps
 
-from celery import Celery
+from celery import Celery, Task
+from django.conf import settings
+from kombu.serialization import dumps
 
 
-app = Celery('base')
+def limit_result_size(task_cls, run):
+    @wraps(run)
+    def wrapper(*args, **kwargs):
+        result = run(*args, **kwargs)
+        _, _, payload = dumps(result, serializer=task_cls.app.conf.result_serializer)
+        if len(payload) > settings.CELERY_RESULT_MAX_SIZE:
+            raise ValueError(f'Result of {task_cls.name} takes {len(payload)} bytes, limit is {settings.CELERY_RESULT_MAX_SIZE}')
+        return result
+    return wrapper
+
+
+class LimitedResultTask(Task):
+    """
+        Fails the task instead of storing result bigger than
+        CELERY_RESULT_MAX_SIZE, results should be ids and counters
+        and never bulk payloads
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # run is wrapped instead of __call__, so Task.__call__ and
+        # the request pushed by the worker stay untouched
+        run = cls.__dict__.get('run')
+        if isinstance(run, staticmethod):
+            cls.run = staticmethod(limit_result_size(cls, run.__func__))
+        elif run is not None:
+            cls.run = limit_result_size(cls, run)
+
+
+app = Celery('base', task_cls=LimitedResultTask)
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
-app.conf.event_serializer = 'pickle'
-app.conf.task_serializer = 'pickle'
-app.conf.result_serializer = 'pickle'
-app.conf.accept_content = ['application/json', 'application/x-python-serialize']
+app.conf.event_serializer = 'json'
+app.conf.task_serializer = 'msgpack'
+app.conf.result_serializer = 'msgpack'
+app.conf.accept_content = ['application/json', 'application/x-msgpack']
+app.conf.result_accept_content = ['application/json', 'application/x-msgpack']
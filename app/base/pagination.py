@@ -0,0 +1,103 @@
+import base64
+import datetime
+import json
+import uuid
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+CURSOR_PARAM = 'cursor'
+SIZE_PARAM = 'size'
+COUNT_PARAM = 'count'
+DEFAULT_SIZE = 5
+MAX_SIZE = 100
+
+
+def encode_cursor(obj, reverse=False) -> str:
+    position = [obj.created.isoformat(), str(obj.id), reverse]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    # values are parsed here, tampered ones must not reach the queryset
+    try:
+        created, id, reverse = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.datetime.fromisoformat(created), uuid.UUID(id), bool(reverse)
+    except (ValueError, TypeError, AttributeError):
+        raise NotFound('Invalid cursor.')
+
+
+def get_page_size(request) -> int:
+    try:
+        size = int(request.query_params.get(SIZE_PARAM, DEFAULT_SIZE))
+    except ValueError:
+        return DEFAULT_SIZE
+    return min(max(size, 1), MAX_SIZE)
+
+
+def is_count_requested(request) -> bool:
+    return request.query_params.get(COUNT_PARAM, '').lower() in ('1', 'true')
+
+
+def get_link(request, cursor):
+    query_params = request.query_params.copy()
+    query_params[CURSOR_PARAM] = cursor
+    # total is requested once, following pages don't repeat the count
+    query_params.pop(COUNT_PARAM, None)
+    query_params.pop('page', None)
+    return f'{request.path}?{query_params.urlencode()}'
+
+
+def paginate_by_cursor(queryset, request) -> dict:
+    """
+        Keyset pagination over (created, id), newest first,
+        the cursor points at the edge row of the previous page,
+        so a page costs one indexed query whatever deep it is.
+        Returns next and previous links and objects of the page
+    """
+
+    size = get_page_size(request)
+    cursor = request.query_params.get(CURSOR_PARAM)
+    reverse = False
+    if cursor:
+        created, id, reverse = decode_cursor(cursor)
+        if reverse:
+            queryset = queryset.filter(Q(created__gt=created) | Q(created=created, id__gt=id))
+        else:
+            queryset = queryset.filter(Q(created__lt=created) | Q(created=created, id__lt=id))
+
+    ordering = ('created', 'id') if reverse else ('-created', '-id')
+    objects = list(queryset.order_by(*ordering)[:size + 1])
+    has_more = len(objects) > size
+    objects = objects[:size]
+    if reverse:
+        objects.reverse()
+
+    has_next = has_more if not reverse else True
+    has_previous = has_more if reverse else bool(cursor)
+    return {
+        'next': get_link(request, encode_cursor(objects[-1])) if objects and has_next else None,
+        'previous': get_link(request, encode_cursor(objects[0], reverse=True)) if objects and has_previous else None,
+        'results': objects,
+    }
+
+
+class CreatedCursorPagination(BasePagination):
+    """
+        DRF pagination class over paginate_by_cursor,
+        the queryset must have created and id fields
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page = paginate_by_cursor(queryset, request)
+        return self.page['results']
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.page['next'],
+            'previous': self.page['previous'],
+            'results': data,
+        })
@@ -228,8 +228,52 @@ CACHES = {
     }
 }
 
+OMDB_API_KEY = os.environ.get('API_KEY')
+OMDB_BASE_URL = os.environ.get('OMDB_BASE_URL', default='https://www.omdbapi.com')
+OMDB_TIMEOUT = float(os.environ.get('OMDB_TIMEOUT', default=10))
+OMDB_POOL_SIZE = int(os.environ.get('OMDB_POOL_SIZE', default=100))
+OMDB_LIMIT_PER_HOST = int(os.environ.get('OMDB_LIMIT_PER_HOST', default=20))
+OMDB_KEEPALIVE_TIMEOUT = float(os.environ.get('OMDB_KEEPALIVE_TIMEOUT', default=60))
+# prefix of cached responses and rate limiter keys in redis
+OMDB_KEY_PREFIX = os.environ.get('OMDB_KEY_PREFIX', default='omdb')
+OMDB_CACHE_TTL = {
+    'search': int(os.environ.get('OMDB_CACHE_TTL_SEARCH', default=60*60)),
+    'id': int(os.environ.get('OMDB_CACHE_TTL_ID', default=60*60*24)),
+    'season': int(os.environ.get('OMDB_CACHE_TTL_SEASON', default=60*60*24)),
+}
+OMDB_RETRIES = int(os.environ.get('OMDB_RETRIES', default=3))
+OMDB_RETRY_BACKOFF = float(os.environ.get('OMDB_RETRY_BACKOFF', default=0.5))
+OMDB_RATE = float(os.environ.get('OMDB_RATE', default=10))
+OMDB_BURST = int(os.environ.get('OMDB_BURST', default=20))
+OMDB_RATE_LIMIT_WAIT = float(os.environ.get('OMDB_RATE_LIMIT_WAIT', default=30))
+OMDB_BACKGROUND_RESERVE = int(os.environ.get('OMDB_BACKGROUND_RESERVE', default=5))
+OMDB_DAILY_QUOTA = int(os.environ.get('OMDB_DAILY_QUOTA', default=100000))
+OMDB_BACKGROUND_DAILY_QUOTA = int(os.environ.get('OMDB_BACKGROUND_DAILY_QUOTA', default=80000))
+
+INGESTION_CONCURRENCY = int(os.environ.get('INGESTION_CONCURRENCY', default=10))
+INGESTION_BATCH_SIZE = int(os.environ.get('INGESTION_BATCH_SIZE', default=500))
+INGESTION_RETRY_ATTEMPTS = int(os.environ.get('INGESTION_RETRY_ATTEMPTS', default=3))
+INGESTION_RETRY_DELAY = int(os.environ.get('INGESTION_RETRY_DELAY', default=60))
+
+SERIES_IMPORT_IN_BACKGROUND = int(os.environ.get('SERIES_IMPORT_IN_BACKGROUND', default=0))
+MEDIA_REFRESH_AGE = int(os.environ.get('MEDIA_REFRESH_AGE', default=7))
+MEDIA_REFRESH_BATCH_SIZE = int(os.environ.get('MEDIA_REFRESH_BATCH_SIZE', default=100))
+PREFETCH_CONCURRENCY = int(os.environ.get('PREFETCH_CONCURRENCY', default=4))
+
+IMPORT_LOCK_TIMEOUT = int(os.environ.get('IMPORT_LOCK_TIMEOUT', default=60*5))
+IMPORT_LOCK_WAIT = int(os.environ.get('IMPORT_LOCK_WAIT', default=60))
+IMPORT_JOB_TIMEOUT = int(os.environ.get('IMPORT_JOB_TIMEOUT', default=60*30))
+
 CELERY_BROKER_URL = f'redis://{REDIS_HOST}:6379'
 CELERY_RESULT_BACKEND = f'redis://{REDIS_HOST}:6379'
+CELERY_RESULT_EXPIRES = timedelta(hours=int(os.environ.get('CELERY_RESULT_EXPIRES_HOURS', default=24)))
+CELERY_RESULT_MAX_SIZE = int(os.environ.get('CELERY_RESULT_MAX_SIZE', default=64*1024))
+CELERY_BEAT_SCHEDULE = {
+    'refresh-stale-media': {
+        'task': 'watchlists.tasks.refresh_stale_media',
+        'schedule': timedelta(hours=1),
+    },
+}
 
 if DEBUG:
     MIDDLEWARE += (
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from discussions.models import Discussion
+
+
+class Command(BaseCommand):
+    help = 'Recomputes comments_count of discussions from their comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        discussions = Discussion.objects \
+            .annotate(comments_number=Count('comments')) \
+            .order_by('id') \
+            .only('id', 'comments_count')
+
+        fixed = 0
+        last_id = None
+        while True:
+            batch = discussions if last_id is None else discussions.filter(id__gt=last_id)
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+            changed = [discussion for discussion in batch if discussion.comments_count != discussion.comments_number]
+            for discussion in changed:
+                discussion.comments_count = discussion.comments_number
+            Discussion.objects.bulk_update(changed, ['comments_count'])
+            fixed += len(changed)
+            last_id = batch[-1].id
+
+        self.stdout.write(f'{fixed} discussions were reconciled')
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:11
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Discussion = apps.get_model('discussions', 'Discussion')
+    Comment = apps.get_model('discussions', 'Comment')
+
+    comments = Comment.objects \
+        .filter(discussion=OuterRef('id')) \
+        .order_by() \
+        .values('discussion') \
+        .annotate(count=Count('id')) \
+        .values('count')
+    Discussion.objects.update(comments_count=Coalesce(Subquery(comments, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0003_alter_comment_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussion',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['discussion', '-created', '-id'], name='comment_discussion_created_idx'),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
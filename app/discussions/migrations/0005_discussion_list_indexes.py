@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('watchlists', '0008_seriesdetail'),
+        ('discussions', '0004_discussion_comments_count_comment_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='discussion',
+            index=models.Index(fields=['-created', '-id'], name='discussion_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='discussion',
+            index=models.Index(fields=['media', '-created', '-id'], name='discussion_media_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='discussion',
+            index=models.Index(fields=['user', '-created', '-id'], name='discussion_user_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='discussion',
+            name='media',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='discussions', to='watchlists.media'),
+        ),
+        migrations.AlterField(
+            model_name='discussion',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='discussions', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -13,13 +13,22 @@ class Discussion(models.Model):
     content = models.TextField(null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
-    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name='discussions')
-    media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='discussions', null=True, blank=True)
+    # indexed by the composite indexes below
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name='discussions', db_index=False)
+    media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='discussions', null=True, blank=True, db_index=False)
+    # maintained by CommentViewSet, drift is fixed by manage.py reconcile_comments_count
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = _('Discussion')
         verbose_name_plural = _('Discussions')
         ordering = ['-created']
+        indexes = [
+            # back cursor pagination of the discussion list, filtered or not
+            models.Index(fields=['-created', '-id'], name='discussion_created_idx'),
+            models.Index(fields=['media', '-created', '-id'], name='discussion_media_created_idx'),
+            models.Index(fields=['user', '-created', '-id'], name='discussion_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -36,6 +45,10 @@ class Comment(models.Model):
         verbose_name = _('Comment')
         verbose_name_plural = _('Comments')
         ordering = ['-created']
+        indexes = [
+            # backs cursor pagination of discussion comments
+            models.Index(fields=['discussion', '-created', '-id'], name='comment_discussion_created_idx'),
+        ]
 
     def __str__(self):
         return self.content[:50]
@@ -1,18 +1,25 @@
 import logging
 
-from django.core.cache import cache
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from discussions.models import Discussion
+from base.cache import invalidate, get_discussion_tag, is_deleted_with
+from discussions.models import Discussion, Comment
+from discussions.viewsets import DISCUSSIONS_CACHE_NAMESPACE
 
 
 logger = logging.getLogger(__name__)
 
 
-@receiver(post_save, sender=Discussion)
+@receiver([post_save, post_delete], sender=Discussion)
 def clear_discussions_cache(sender, instance, **kwargs):
-    for key in cache.keys('*'):
-        if 'discussions_viewset' in key.split('.'):
-            cache.delete(key)
-            logger.info(f'{sender.__name__}’s key: {key} was deleted')
+    invalidate(DISCUSSIONS_CACHE_NAMESPACE, get_discussion_tag(instance.pk))
+    logger.info(f'{sender.__name__} {instance.pk} invalidated cached discussions')
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def clear_discussion_cache(sender, instance, **kwargs):
+    if is_deleted_with(kwargs.get('origin'), Discussion):
+        return
+    # the list holds no comments, only the discussion page is purged
+    invalidate(get_discussion_tag(instance.discussion_id))
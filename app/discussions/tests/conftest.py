@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 
@@ -8,6 +9,12 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture(autouse=True)
+def clear_discussions_cache():
+    # invalidation runs on commit, which never happens inside a test
+    cache.delete_pattern('*discussion*_viewset*')
+
+
 @pytest.fixture
 def user():
     user = get_user_model().objects.create(
@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from model_bakery import baker
 
-from discussions.models import Comment
+from discussions.models import Comment, Discussion
 
 
 pytestmark = pytest.mark.django_db
@@ -74,6 +74,17 @@ class TestCommentViewSet:
         assert response.json().get('user') == str(user.id), 'The response object must belong to the given user'
         assert Comment.objects.count() == 1, 'The db must contain one comment'
 
+    def test_create_increments_comments_count_of_discussion(self, api_client, user):
+        # given
+        discussion = baker.make('discussions.Discussion')
+        comment = {'discussion': discussion.id, 'content': 'content for comment'}
+        api_client.force_authenticate(user=user)
+        # when
+        response = api_client.post(reverse('discussions_app:comments-list'), comment)
+        # then
+        assert response.status_code == 201, 'Status code of response must be 201'
+        assert Discussion.objects.get(id=discussion.id).comments_count == 1, 'Comments count of the discussion must be incremented'
+
     # update
     def test_update_with_unauthenticated_user(self, api_client, owner):
         # given
@@ -237,3 +248,14 @@ class TestCommentViewSet:
         # then
         assert response.status_code == 204, 'Status code of response must be 204'
         assert Comment.objects.count() == 0, 'The db must contain no comments'
+
+    def test_destroy_decrements_comments_count_of_discussion(self, api_client, owner):
+        # given
+        discussion = baker.make('discussions.Discussion', comments_count=1)
+        comment = baker.make('discussions.Comment', user=owner, discussion=discussion)
+        api_client.force_authenticate(user=owner)
+        # when
+        response = api_client.delete(reverse('discussions_app:comments-detail', args=(comment.id,)))
+        # then
+        assert response.status_code == 204, 'Status code of response must be 204'
+        assert Discussion.objects.get(id=discussion.id).comments_count == 0, 'Comments count of the discussion must be decremented'
@@ -1,8 +1,11 @@
+import datetime
+
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
 from model_bakery import baker
 
-from discussions.models import Discussion
+from discussions.models import Discussion, Comment
 
 
 pytestmark = pytest.mark.django_db
@@ -17,7 +20,7 @@ class TestDiscussionViewSet:
         response = api_client.get(reverse('discussions_app:discussions-list'))
         # then
         assert response.status_code == 200, 'Status code of response must be 200'
-        assert len(response.json()) == 1, 'The response must contain one discussion'
+        assert len(response.json()['results']) == 1, 'The response must contain one discussion'
 
     def test_list_with_authenticated_user(self, api_client, user):
         # given
@@ -27,7 +30,73 @@ class TestDiscussionViewSet:
         response = api_client.get(reverse('discussions_app:discussions-list'))
         # then
         assert response.status_code == 200, 'Status code of response must be 200'
-        assert len(response.json()) == 1, 'The response must contain one discussion'
+        assert len(response.json()['results']) == 1, 'The response must contain one discussion'
+
+    def test_list_is_paginated_by_cursor(self, api_client):
+        # given
+        baker.make('discussions.Discussion', _quantity=7)
+        expected = [str(id) for id in Discussion.objects.order_by('-created', '-id').values_list('id', flat=True)]
+        # when
+        pages = [api_client.get(reverse('discussions_app:discussions-list'), {'size': 3}).json()]
+        while pages[-1]['next']:
+            pages.append(api_client.get(pages[-1]['next']).json())
+        # then
+        assert [discussion['id'] for page in pages for discussion in page['results']] == expected, 'Pages must hold all discussions, newest first'
+        assert [len(page['results']) for page in pages] == [3, 3, 1], 'Pages must be of the requested size'
+
+    def test_list_filtered_by_media(self, api_client):
+        # given
+        media = baker.make('watchlists.Media')
+        discussion = baker.make('discussions.Discussion', media=media)
+        baker.make('discussions.Discussion', media=baker.make('watchlists.Media'))
+        # when
+        response = api_client.get(reverse('discussions_app:discussions-list'), {'media': media.id})
+        # then
+        assert response.status_code == 200, 'Status code of response must be 200'
+        assert [d['id'] for d in response.json()['results']] == [str(discussion.id)], 'Only discussions of the given media must be returned'
+
+    def test_list_filtered_by_user(self, api_client, user, owner):
+        # given
+        discussion = baker.make('discussions.Discussion', user=user)
+        baker.make('discussions.Discussion', user=owner)
+        # when
+        response = api_client.get(reverse('discussions_app:discussions-list'), {'user': user.id})
+        # then
+        assert response.status_code == 200, 'Status code of response must be 200'
+        assert [d['id'] for d in response.json()['results']] == [str(discussion.id)], 'Only discussions of the given user must be returned'
+
+    def test_list_filtered_by_incorrect_media(self, api_client):
+        # when
+        response = api_client.get(reverse('discussions_app:discussions-list'), {'media': 'incorrect_media'})
+        # then
+        assert response.status_code == 404, 'Status code of response must be 404'
+
+    def test_list_cache_is_invalidated_on_delete(self, api_client, django_capture_on_commit_callbacks):
+        # given
+        discussion = baker.make('discussions.Discussion')
+        api_client.get(reverse('discussions_app:discussions-list'))
+        # when
+        with django_capture_on_commit_callbacks(execute=True):
+            discussion.delete()
+        response = api_client.get(reverse('discussions_app:discussions-list'))
+        # then
+        assert response.json()['results'] == [], 'Deleted discussion must not be served from cache'
+
+    def test_list_cache_is_invalidated_on_discussion_changes(self, api_client, mocker, django_capture_on_commit_callbacks):
+        # given
+        discussion = baker.make('discussions.Discussion')
+        keys = mocker.spy(cache, 'keys')
+        first = api_client.get(reverse('discussions_app:discussions-list'))
+        cached = api_client.get(reverse('discussions_app:discussions-list'))
+        # when
+        with django_capture_on_commit_callbacks(execute=True):
+            discussion.title = 'new title'
+            discussion.save()
+        response = api_client.get(reverse('discussions_app:discussions-list'))
+        # then
+        assert cached.json() == first.json(), 'The second response must be served from cache'
+        assert response.json()['results'][0]['title'] == 'new title', 'Changed discussion must not be served from cache'
+        assert not keys.called, 'Invalidation must not scan keys of the cache'
 
     # retrieve
     def test_retrieve_with_unauthenticated_user(self, api_client):
@@ -49,6 +118,40 @@ class TestDiscussionViewSet:
         assert response.status_code == 200, 'Status code of response must be 200'
         assert response.json().get('id') == str(discussion.id),  'The response must contain id of the given discussion'
 
+    def test_retrieve_comments_are_paginated_by_cursor(self, api_client):
+        # given
+        discussion = baker.make('discussions.Discussion', comments_count=7)
+        comments = baker.make('discussions.Comment', discussion=discussion, _quantity=7)
+        for days, comment in enumerate(comments):
+            Comment.objects.filter(id=comment.id).update(created=datetime.date(2023, 1, 1) + datetime.timedelta(days=days % 3))
+        expected = [str(id) for id in Comment.objects.filter(discussion=discussion).order_by('-created', '-id').values_list('id', flat=True)]
+        # when
+        pages = [api_client.get(reverse('discussions_app:discussions-detail', args=(discussion.id,)), {'size': 3}).json()['comments']]
+        while pages[-1]['next']:
+            pages.append(api_client.get(pages[-1]['next']).json()['comments'])
+        # then
+        assert [comment['id'] for page in pages for comment in page['results']] == expected, 'Pages must hold all comments, newest first'
+        assert [len(page['results']) for page in pages] == [3, 3, 1], 'Pages must be of the requested size'
+        assert pages[0]['count'] == 7, 'Count must be taken from the comments count of the discussion'
+
+    def test_retrieve_cache_is_invalidated_on_comment_changes(self, api_client, user, django_capture_on_commit_callbacks, django_assert_num_queries):
+        # given
+        discussion = baker.make('discussions.Discussion')
+        other_discussion = baker.make('discussions.Discussion')
+        api_client.get(reverse('discussions_app:discussions-detail', args=(discussion.id,)))
+        api_client.get(reverse('discussions_app:discussions-detail', args=(other_discussion.id,)))
+        # when
+        api_client.force_authenticate(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(reverse('discussions_app:comments-list'), {'discussion': discussion.id, 'content': 'content'})
+        api_client.force_authenticate(user=None)
+        response = api_client.get(reverse('discussions_app:discussions-detail', args=(discussion.id,)))
+        with django_assert_num_queries(0):
+            other_response = api_client.get(reverse('discussions_app:discussions-detail', args=(other_discussion.id,)))
+        # then
+        assert response.json()['comments']['count'] == 1, 'Discussion with a new comment must not be served from cache'
+        assert other_response.status_code == 200, 'Other discussions must be served from cache'
+
     # create
     def test_create_with_unauthenticated_user(self, api_client):
         # given
@@ -210,6 +313,18 @@ class TestDiscussionViewSet:
         assert response.status_code == 204, 'Status code of response must be 204'
         assert Discussion.objects.count() == 0, 'The db must contain no discussions'
 
+    def test_destroy_with_many_comments_purges_discussion_page_once(self, api_client, owner, django_capture_on_commit_callbacks):
+        # given
+        discussion = baker.make('discussions.Discussion', user=owner)
+        baker.make('discussions.Comment', discussion=discussion, _quantity=50)
+        api_client.force_authenticate(user=owner)
+        # when
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            response = api_client.delete(reverse('discussions_app:discussions-detail', args=(discussion.id,)))
+        # then
+        assert response.status_code == 204, 'Status code of response must be 204'
+        assert len(callbacks) == 1, 'Comments deleted with the discussion must not purge the page on their own'
+
     def test_destroy_with_admin(self, api_client, owner, admin):
         # given
         discussion = baker.prepare('discussions.Discussion')
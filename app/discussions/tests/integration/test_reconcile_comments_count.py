@@ -0,0 +1,25 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reconcile_comments_count_recomputes_counters():
+    # given
+    drifted = baker.make("discussions.Discussion", comments_count=10)
+    baker.make("discussions.Comment", discussion=drifted, _quantity=2)
+    correct = baker.make("discussions.Discussion", comments_count=1)
+    baker.make("discussions.Comment", discussion=correct)
+    out = StringIO()
+    # when
+    call_command("reconcile_comments_count", batch_size=1, stdout=out)
+    # then
+    drifted.refresh_from_db()
+    correct.refresh_from_db()
+    assert drifted.comments_count == 2, "Drifted counter must be recomputed"
+    assert correct.comments_count == 1, "Correct counter must stay the same"
+    assert "1 discussions were reconciled" in out.getvalue(), "Only drifted discussion must be reported"
@@ -1,10 +1,16 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import F
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_cookie
 from rest_framework import mixins
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.viewsets import ModelViewSet, GenericViewSet
 
+from base.cache import versioned_cache_page, get_discussion_tag
+from base.pagination import CreatedCursorPagination
 from discussions.models import Discussion, Comment
 from discussions.serializers import (
     DiscussionSerializer, DiscussionSerializerForRetrieve,
@@ -13,15 +19,46 @@ from discussions.serializers import (
 from users.permissions import IsOwnerOrIsAdminOrReadOnly
 
 
+DISCUSSIONS_CACHE_NAMESPACE = 'discussions_viewset'
+
+
+def get_discussion_tags(request, pk, **kwargs):
+    return [get_discussion_tag(pk)]
+
+
 class DiscussionViewSet(ModelViewSet):
     queryset = Discussion.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrIsAdminOrReadOnly]
+    pagination_class = CreatedCursorPagination
+    filter_params = ('media', 'user')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        for param in self.filter_params:
+            value = self.request.query_params.get(param)
+            if value is not None:
+                queryset = queryset.filter(**{param: self.validate_uuid(value)})
+        return queryset
+
+    @staticmethod
+    def validate_uuid(value):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            raise NotFound(f'Invalid id: {value}.')
 
     @method_decorator(vary_on_cookie)
-    @method_decorator(cache_page(60*5, key_prefix='discussions_viewset'))
+    @method_decorator(versioned_cache_page(60*5, namespace=DISCUSSIONS_CACHE_NAMESPACE))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @method_decorator(vary_on_cookie)
+    @method_decorator(versioned_cache_page(60*5, namespace='discussion_viewset', get_tags=get_discussion_tags))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -38,8 +75,17 @@ class CommentViewSet(mixins.CreateModelMixin,
     queryset = Comment.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrIsAdminOrReadOnly]
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        comment = serializer.save(user=self.request.user)
+        Discussion.objects.filter(id=comment.discussion_id).update(comments_count=F('comments_count') + 1)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        Discussion.objects \
+            .filter(id=instance.discussion_id, comments_count__gt=0) \
+            .update(comments_count=F('comments_count') - 1)
 
     def get_serializer_class(self):
         if self.action in ('update', 'partial_update'):
@@ -9,7 +9,7 @@ class ReviewLikesInline(admin.TabularInline):
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('user', 'media', 'stars', 'created', 'get_likes')
+    list_display = ('user', 'media', 'stars', 'created', 'likes_count', 'dislikes_count')
     list_filter = ('stars', 'media')
     fields = ('user', 'title', 'content', 'stars', 'media')
     inlines = [
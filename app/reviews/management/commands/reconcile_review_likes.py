@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Recomputes likes_count and dislikes_count of reviews from their reviewlikes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        reviews = Review.objects.with_likes_numbers().order_by('id').only('id', 'likes_count', 'dislikes_count')
+
+        fixed = 0
+        last_id = None
+        while True:
+            batch = reviews if last_id is None else reviews.filter(id__gt=last_id)
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+            changed = [
+                review for review in batch
+                if (review.likes_count, review.dislikes_count) != (review.likes_number, review.dislikes_number)
+            ]
+            for review in changed:
+                review.likes_count = review.likes_number
+                review.dislikes_count = review.dislikes_number
+            Review.objects.bulk_update(changed, ['likes_count', 'dislikes_count'])
+            fixed += len(changed)
+            last_id = batch[-1].id
+
+        self.stdout.write(f'{fixed} reviews were reconciled')
@@ -0,0 +1,19 @@
+from django.db import models
+from django.db.models import Count, Prefetch, Q
+
+from reviews import models as m
+
+
+class ReviewQuerySet(models.QuerySet):
+    def with_likes_numbers(self):
+        return self.annotate(
+            likes_number=Count('users_liked', filter=Q(users_liked__like=True)),
+            dislikes_number=Count('users_liked', filter=Q(users_liked__like=False)),
+        )
+
+    def with_current_user_reviewlike(self, user):
+        if not user.is_authenticated:
+            return self
+        return self.prefetch_related(
+            Prefetch('users_liked', queryset=m.ReviewLikes.objects.filter(user=user), to_attr='current_user_reviewlikes')
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:08
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ReviewLikes = apps.get_model('reviews', 'ReviewLikes')
+
+    def counted(like):
+        likes = ReviewLikes.objects \
+            .filter(review=OuterRef('id'), like=like) \
+            .order_by() \
+            .values('review') \
+            .annotate(count=Count('id')) \
+            .values('count')
+        return Coalesce(Subquery(likes, output_field=IntegerField()), 0)
+
+    Review.objects.update(likes_count=counted(True), dislikes_count=counted(False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_alter_review_user_alter_reviewlikes_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='dislikes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
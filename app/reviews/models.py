@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils.translation import gettext as _
 
+from reviews.managers import ReviewQuerySet
 from watchlists.models import Media
 
 
@@ -23,11 +24,20 @@ class Review(models.Model):
         ]
     )
     likes = models.ManyToManyField(get_user_model(), through='ReviewLikes', through_fields=('review', 'user'))
+    # maintained by ReviewLikeViewSet, recomputed by reconcile_review_likes command
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Review')
         verbose_name_plural = _('Reviews')
         ordering = ['-created']
+        indexes = [
+            # backs cursor pagination of media reviews
+            models.Index(fields=['media', '-created', '-id'], name='review_media_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -45,3 +55,7 @@ class ReviewLikes(models.Model):
         verbose_name = _('ReviewLikes')
         verbose_name_plural = _('ReviewLikes')
         unique_together = ('review', 'user')
+
+    @staticmethod
+    def get_counter_field(like):
+        return 'likes_count' if like else 'dislikes_count'
@@ -18,10 +18,10 @@ class ReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
     def get_likes_number(self, obj):
-        return obj.users_liked.filter(like=True).count()
+        return obj.likes_count
 
     def get_dislikes_number(self, obj):
-        return obj.users_liked.filter(like=False).count()
+        return obj.dislikes_count
 
     def get_current_user_reviewlike(self, obj):
         request = self.context.get('request')
@@ -32,9 +32,13 @@ class ReviewSerializer(serializers.ModelSerializer):
         if not current_user.is_authenticated:
             return None
 
-        try:
-            reviewlike = obj.users_liked.get(user=current_user)
-        except ReviewLikes.DoesNotExist:
+        # current user reviewlike comes from ReviewQuerySet
+        # prefetch if present, single reviews are queried directly
+        if hasattr(obj, 'current_user_reviewlikes'):
+            reviewlike = next(iter(obj.current_user_reviewlikes), None)
+        else:
+            reviewlike = obj.users_liked.filter(user=current_user).first()
+        if reviewlike is None:
             return None
 
         return {'id': reviewlike.id, 'like': reviewlike.like}
@@ -0,0 +1,30 @@
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from base.cache import invalidate, get_media_tag, is_deleted_with
+from reviews.models import Review, ReviewLikes
+from watchlists.models import Media
+
+
+logger = logging.getLogger(__name__)
+
+
+def clear_media_cache(media):
+    for imdb_id in media.values_list('imdb_id', flat=True):
+        invalidate(get_media_tag(imdb_id))
+        logger.info(f'Cached media {imdb_id} was invalidated')
+
+
+@receiver([post_save, post_delete], sender=Review)
+def clear_review_media_cache(sender, instance, **kwargs):
+    clear_media_cache(Media.objects.filter(id=instance.media_id))
+
+
+@receiver([post_save, post_delete], sender=ReviewLikes)
+def clear_reviewlike_media_cache(sender, instance, **kwargs):
+    if is_deleted_with(kwargs.get('origin'), Review):
+        return
+    # likes counters of the review are shown on the media page
+    clear_media_cache(Media.objects.filter(reviews=instance.review_id))
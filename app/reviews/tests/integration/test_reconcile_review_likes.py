@@ -0,0 +1,26 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reconcile_review_likes_recomputes_counters():
+    # given
+    drifted = baker.make("reviews.Review", likes_count=10, dislikes_count=0)
+    baker.make("reviews.ReviewLikes", review=drifted, like=True)
+    baker.make("reviews.ReviewLikes", review=drifted, like=False, _quantity=2)
+    correct = baker.make("reviews.Review", likes_count=1, dislikes_count=0)
+    baker.make("reviews.ReviewLikes", review=correct, like=True)
+    out = StringIO()
+    # when
+    call_command("reconcile_review_likes", batch_size=1, stdout=out)
+    # then
+    drifted.refresh_from_db()
+    correct.refresh_from_db()
+    assert (drifted.likes_count, drifted.dislikes_count) == (1, 2), "Drifted counters must be recomputed"
+    assert (correct.likes_count, correct.dislikes_count) == (1, 0), "Correct counters must stay the same"
+    assert "1 reviews were reconciled" in out.getvalue(), "Only drifted review must be reported"
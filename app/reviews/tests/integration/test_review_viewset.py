@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from model_bakery import baker
 
+from base.cache import get_generations, get_media_tag
 from reviews.models import Review
 
 
@@ -237,3 +238,19 @@ class TestReviewViewSet:
         # then
         assert response.status_code == 204, 'Status code of response must be 204'
         assert Review.objects.count() == 0, 'The db must contain no reviews'
+
+    def test_destroy_with_many_likes_purges_media_page_once(self, api_client, owner, django_capture_on_commit_callbacks, django_assert_max_num_queries):
+        # given
+        review = baker.make('reviews.Review', user=owner, media=baker.make('watchlists.Media'))
+        baker.make('reviews.ReviewLikes', review=review, _quantity=50)
+        tag = get_media_tag(review.media.imdb_id)
+        [generation] = get_generations([tag])
+        api_client.force_authenticate(user=owner)
+        # when
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            with django_assert_max_num_queries(12):
+                response = api_client.delete(reverse('reviews_app:reviews-detail', args=(review.id,)))
+        # then
+        assert response.status_code == 204, 'Status code of response must be 204'
+        assert len(callbacks) == 1, 'Likes deleted with the review must not purge the media page on their own'
+        assert get_generations([tag]) == [generation + 1], 'Media page of the review must be purged'
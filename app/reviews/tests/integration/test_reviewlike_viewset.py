@@ -74,6 +74,19 @@ class TestReviewLikesViewSet:
         assert response.json().get('user') == str(user.id), "The response object must belong to the given user"
         assert ReviewLikes.objects.count() == 1, "The db must contain one reviewlike"
 
+    @pytest.mark.parametrize("like, counter", [("true", "likes_count"), ("false", "dislikes_count")])
+    def test_create_increments_review_counter(self, api_client, user, like, counter):
+        # given
+        review = baker.make("reviews.Review", likes_count=3, dislikes_count=3)
+        api_client.force_authenticate(user=user)
+        # when
+        response = api_client.post(reverse("reviews_app:reviewlikes-list"), {"review": review.id, "like": like})
+        # then
+        review.refresh_from_db()
+        assert response.status_code == 201, "Status code of response must be 201"
+        assert getattr(review, counter) == 4, "The counter of the reviewlike kind must be incremented"
+        assert review.likes_count + review.dislikes_count == 7, "The other counter must stay the same"
+
     # update
     def test_update_with_unauthenticated_user(self, api_client, owner):
         # given
@@ -225,6 +238,18 @@ class TestReviewLikesViewSet:
         assert response.status_code == 204, "Status code of response must be 204"
         assert ReviewLikes.objects.count() == 0, "The db must contain no reviewlikes"
 
+    def test_destroy_decrements_review_counter(self, api_client, owner):
+        # given
+        review = baker.make("reviews.Review", likes_count=3, dislikes_count=3)
+        reviewlike = baker.make("reviews.ReviewLikes", user=owner, review=review, like=True)
+        api_client.force_authenticate(user=owner)
+        # when
+        response = api_client.delete(reverse("reviews_app:reviewlikes-detail", args=(reviewlike.id,)))
+        # then
+        review.refresh_from_db()
+        assert response.status_code == 204, "Status code of response must be 204"
+        assert (review.likes_count, review.dislikes_count) == (2, 3), "Only likes counter must be decremented"
+
     def test_destroy_with_admin(self, api_client, owner, admin):
         # given
         reviewlike = baker.prepare("reviews.ReviewLikes")
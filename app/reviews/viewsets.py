@@ -1,4 +1,5 @@
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.http import Http404
 from rest_framework import mixins
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -39,6 +40,15 @@ class ReviewLikeViewSet(mixins.CreateModelMixin,
 
     def perform_create(self, serializer):
         try:
-            serializer.save(user=self.request.user)
+            with transaction.atomic():
+                reviewlike = serializer.save(user=self.request.user)
+                counter = ReviewLikes.get_counter_field(reviewlike.like)
+                Review.objects.filter(id=reviewlike.review_id).update(**{counter: F(counter) + 1})
         except IntegrityError:
             raise Http404
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        counter = ReviewLikes.get_counter_field(instance.like)
+        Review.objects.filter(id=instance.review_id, **{f'{counter}__gt': 0}).update(**{counter: F(counter) - 1})
@@ -3,6 +3,7 @@ import logging
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 
+from base.cache import invalidate, get_user_tag
 from users.models import User, UserProfile
 
 
@@ -20,3 +21,9 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     instance.userprofile.save()
     logger.info(f'Profile {instance} was saved.')
+
+
+@receiver(post_save, sender=UserProfile)
+def clear_user_profile_cache(sender, instance, **kwargs):
+    # user changes are covered too, saving a user saves the profile
+    invalidate(get_user_tag(instance.user_id))
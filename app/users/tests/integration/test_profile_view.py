@@ -0,0 +1,46 @@
+import pytest
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from users.models import User
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestProfileView:
+    def test_get_is_invalidated_on_profile_changes(self, api_client, django_capture_on_commit_callbacks, django_assert_num_queries):
+        # given
+        cache.delete_pattern('*to_userprofile_cache*')
+        user = User.objects.create(email='profile_user@email.com', username='profile_user_name')
+        other_user = User.objects.create(email='other_user@email.com', username='other_user_name')
+        api_client.get(reverse('users_app:profile', args=(user.username,)))
+        api_client.get(reverse('users_app:profile', args=(other_user.username,)))
+        # when
+        with django_capture_on_commit_callbacks(execute=True):
+            user.userprofile.bio = 'new bio'
+            user.userprofile.save()
+        response = api_client.get(reverse('users_app:profile', args=(user.username,)))
+        # only username is resolved to id of the tag
+        with django_assert_num_queries(1):
+            other_response = api_client.get(reverse('users_app:profile', args=(other_user.username,)))
+        # then
+        assert response.status_code == 200, 'Status code of response must be 200'
+        assert response.json()['profile']['bio'] == 'new bio', 'Changed profile must not be served from cache'
+        assert other_response.status_code == 200, 'Other profiles must be served from cache'
+
+    def test_get_with_old_username_after_rename(self, api_client, django_capture_on_commit_callbacks):
+        # given
+        cache.delete_pattern('*to_userprofile_cache*')
+        user = User.objects.create(email='renamed_user@email.com', username='old_user_name')
+        api_client.get(reverse('users_app:profile', args=('old_user_name',)))
+        # when
+        with django_capture_on_commit_callbacks(execute=True):
+            user.username = 'new_user_name'
+            user.save()
+        old_response = api_client.get(reverse('users_app:profile', args=('old_user_name',)))
+        new_response = api_client.get(reverse('users_app:profile', args=('new_user_name',)))
+        # then
+        assert old_response.status_code == 404, 'Status code of response must be 404'
+        assert new_response.json()['username'] == 'new_user_name', 'Renamed profile must be served by the new username'
@@ -5,11 +5,11 @@ import requests
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import EmailMultiAlternatives
+from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils.decorators import method_decorator
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
-from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_cookie
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, RetrieveAPIView, UpdateAPIView
@@ -21,6 +21,7 @@ from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, Ou
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from base.cache import versioned_cache_page, get_user_tag
 from users.managers import UserManager
 from users.models import User
 from notifications.utils import create_notification
@@ -110,46 +111,22 @@ class GoogleAuthView(APIView):
         return Response(response, status=status.HTTP_302_FOUND)
 
 
-class ProfileView(RetrieveAPIView):
-    serializer_class = UserSerializer
-
-    @method_decorator(vary_on_cookie)
-    @method_decorator(cache_page(60*60*1, key_prefix='userprofile_cache'))
-    def get(self, *args, **kwargs):
-        return super().get(*args, **kwargs)
-
-    def get_object(self, **kwargs):
-        return User.objects.get(username=self.kwargs['username'])
-
-
-class UpdateProfileView(UpdateAPIView):
-    queryset = User.objects.all()
-    permission_classes = [IsAuthenticated]
-    serializer_class = UpdateProfileSerializer
-
-    def get_object(self):
-        return self.request.user
-
-
-class ChangePasswordView(UpdateAPIView):
-    queryset = User.objects.all()
-    permission_classes = [IsAuthenticated]
-    serializer_class = ChangePasswordSerializer
-
-    def get_object(self):
-        return self.request.user
+def get_profile_tags(request, username, **kwargs):
+    # usernames can be changed, pages are tagged by id which can't
+    user_id = User.objects.filter(username=username).values_list('id', flat=True).first()
+    return [get_user_tag(user_id)]
 
 
 class ProfileView(RetrieveAPIView):
     serializer_class = UserSerializer
 
     @method_decorator(vary_on_cookie)
-    @method_decorator(cache_page(60*60*1, key_prefix='to_userprofile_cache'))
+    @method_decorator(versioned_cache_page(60*60*1, namespace='to_userprofile_cache', get_tags=get_profile_tags))
     def get(self, *args, **kwargs):
         return super().get(*args, **kwargs)
 
     def get_object(self, **kwargs):
-        return User.objects.get(username=self.kwargs['username'])
+        return get_object_or_404(User, username=self.kwargs['username'])
 
 
 class UpdateProfileView(UpdateAPIView):
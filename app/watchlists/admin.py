@@ -4,11 +4,11 @@ from watchlists.models import Media, Season, Episode
 
 
 class SeasonInline(admin.TabularInline):
-    model = Media.seasons.through
+    model = Season
 
 
 class EpisodeInline(admin.TabularInline):
-    model = Season.episodes.through
+    model = Episode
 
 
 @admin.register(Episode)
@@ -16,13 +16,14 @@ class EpisodeAdmin(admin.ModelAdmin):
     list_display = ('title', 'released', 'episode_numb', 'imdb_rating')
     list_filter = ('imdb_rating', 'episode_numb')
     search_fields = ('title',)
+    raw_id_fields = ('season',)
 
 
 @admin.register(Season)
 class MediaAdmin(admin.ModelAdmin):
     list_display = ('season_numb', 'total_episodes')
     list_filter = ('season_numb',)
-    exclude = ('episodes',)
+    raw_id_fields = ('series',)
     inlines = [
         EpisodeInline,
     ]
@@ -33,7 +34,6 @@ class MediaAdmin(admin.ModelAdmin):
     list_display = ('title', 'media_type', 'released', 'imdb_id', 'imdb_rating')
     list_filter = ('imdb_rating', 'media_type')
     search_fields = ('title',)
-    exclude = ('seasons',)
     inlines = [
         SeasonInline,
     ]
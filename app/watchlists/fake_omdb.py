@@ -0,0 +1,216 @@
+"""
+Local OMDb-compatible stand-in for load tests and benchmarks.
+
+Synthetic titles are encoded in their imdb ids, so any size of series
+is available without a stored dataset:
+    movie    tt6NNNNNN                  e.g. tt6000001
+    series   tt8SSSEEE                  SSS seasons with EEE episodes each
+    episode  tt7SSSEEEsssee             episode ee of season sss of such series
+
+Recorded responses of real OMDb are replayed from fixtures directory,
+one JSON file per query, see get_fixture_name. Missing ones are recorded
+from upstream OMDb if it is given, otherwise synthetic payload is served.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+
+
+MOVIE_ID = re.compile(r'^tt6(\d{6})$')
+SERIES_ID = re.compile(r'^tt8(\d{3})(\d{3})$')
+EPISODE_ID = re.compile(r'^tt7(\d{3})(\d{3})(\d{3})(\d{3})$')
+
+POSTER = 'https://m.media-amazon.com/images/M/fake-poster.jpg'
+NOT_FOUND = {'Response': 'False', 'Error': 'Incorrect IMDb ID.'}
+
+
+def get_series_id(total_seasons, episodes_per_season):
+    return f'tt8{total_seasons:03}{episodes_per_season:03}'
+
+
+def get_movie(number):
+    return {
+        'Title': f'Movie {number}', 'Year': '2020', 'Rated': 'PG-13', 'Released': '01 Jan 2020',
+        'Runtime': '120 min', 'Genre': 'Drama', 'Director': 'N/A', 'Writer': 'N/A', 'Actors': 'N/A',
+        'Plot': f'Plot of movie {number}.', 'Language': 'English', 'Country': 'United States',
+        'Awards': 'N/A', 'Poster': POSTER, 'Ratings': [], 'Metascore': 'N/A',
+        'imdbRating': f'{random.Random(number).uniform(1, 10):.1f}', 'imdbVotes': '1,000',
+        'imdbID': f'tt6{number:06}', 'Type': 'movie', 'Response': 'True',
+    }
+
+
+def get_series(total_seasons, episodes_per_season):
+    return {
+        'Title': f'Series {total_seasons}x{episodes_per_season}', 'Year': '2000–', 'Rated': 'TV-MA',
+        'Released': '01 Jan 2000', 'Runtime': '45 min', 'Genre': 'Drama', 'Director': 'N/A',
+        'Writer': 'N/A', 'Actors': 'N/A', 'Plot': f'Series with {total_seasons} seasons.',
+        'Language': 'English', 'Country': 'United States', 'Awards': 'N/A', 'Poster': POSTER,
+        'Ratings': [], 'Metascore': 'N/A', 'imdbRating': '8.0', 'imdbVotes': '1,000',
+        'imdbID': get_series_id(total_seasons, episodes_per_season), 'Type': 'series',
+        'totalSeasons': str(total_seasons), 'Response': 'True',
+    }
+
+
+def get_season(total_seasons, episodes_per_season, season_numb):
+    return {
+        'Title': f'Series {total_seasons}x{episodes_per_season}', 'Season': str(season_numb),
+        'totalSeasons': str(total_seasons), 'Response': 'True',
+        'Episodes': [
+            {
+                'Title': f'Episode {episode_numb}', 'Released': '2000-01-01', 'Episode': str(episode_numb),
+                'imdbRating': '7.5',
+                'imdbID': f'tt7{total_seasons:03}{episodes_per_season:03}{season_numb:03}{episode_numb:03}',
+            }
+            for episode_numb in range(1, episodes_per_season + 1)
+        ],
+    }
+
+
+def get_episode(total_seasons, episodes_per_season, season_numb, episode_numb):
+    return {
+        'Title': f'Episode {episode_numb}', 'Year': '2000', 'Rated': 'TV-MA', 'Released': '01 Jan 2000',
+        'Season': str(season_numb), 'Episode': str(episode_numb), 'Runtime': '45 min', 'Genre': 'Drama',
+        'Director': 'N/A', 'Writer': 'N/A', 'Actors': 'N/A',
+        'Plot': f'Episode {episode_numb} of season {season_numb}.', 'Language': 'English',
+        'Country': 'United States', 'Awards': 'N/A', 'Poster': POSTER, 'Ratings': [],
+        'Metascore': 'N/A', 'imdbRating': '7.5', 'imdbVotes': '100',
+        'imdbID': f'tt7{total_seasons:03}{episodes_per_season:03}{season_numb:03}{episode_numb:03}',
+        'seriesID': get_series_id(total_seasons, episodes_per_season), 'Type': 'episode', 'Response': 'True',
+    }
+
+
+def get_search(search, page):
+    return {
+        'Search': [
+            {'Title': f'{search.title()} {number}', 'Year': '2020', 'imdbID': f'tt6{number:06}', 'Type': 'movie', 'Poster': POSTER}
+            for number in range((page - 1) * 10 + 1, page * 10 + 1)
+        ],
+        'totalResults': '100',
+        'Response': 'True',
+    }
+
+
+def get_payload(query):
+    if search := query.get('s'):
+        return get_search(search, int(query.get('page') or 1))
+
+    imdb_id = query.get('i', '')
+    if match := MOVIE_ID.match(imdb_id):
+        return get_movie(int(match[1]))
+    if match := EPISODE_ID.match(imdb_id):
+        total_seasons, episodes_per_season, season_numb, episode_numb = map(int, match.groups())
+        if 1 <= season_numb <= total_seasons and 1 <= episode_numb <= episodes_per_season:
+            return get_episode(total_seasons, episodes_per_season, season_numb, episode_numb)
+    if match := SERIES_ID.match(imdb_id):
+        total_seasons, episodes_per_season = map(int, match.groups())
+        if 'Season' not in query:
+            return get_series(total_seasons, episodes_per_season)
+        season_numb = int(query['Season'])
+        if 1 <= season_numb <= total_seasons:
+            return get_season(total_seasons, episodes_per_season, season_numb)
+        return {'Response': 'False', 'Error': 'Series or season not found!'}
+    return NOT_FOUND
+
+
+def get_fixture_name(query):
+    # api key is not part of recorded query
+    params = sorted((key, value) for key, value in query.items() if key != 'apikey')
+    return '&'.join(f'{key}={value}' for key, value in params) + '.json'
+
+
+async def record_payload(session, upstream, query, path):
+    async with session.get(upstream, params=query) as response:
+        response.raise_for_status()
+        payload = await response.json(content_type=None)
+    path.write_text(json.dumps(payload, indent=2))
+    return payload
+
+
+def make_app(latency=0.0, jitter=0.0, error_rate=0.0, seed=None, fixtures=None, upstream=None):
+    """
+        latency and jitter are in seconds,
+        error_rate is share of requests answered with 503,
+        fixtures is directory of recorded responses,
+        upstream is url of OMDb to record missing ones from
+    """
+
+    rand = random.Random(seed)
+    stats = Counter()
+    fixtures = Path(fixtures) if fixtures else None
+
+    async def handle(request):
+        stats['requests'] += 1
+        delay = latency + rand.uniform(0, jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if rand.random() < error_rate:
+            stats['errors'] += 1
+            return web.Response(status=503)
+        if fixtures is None:
+            return web.json_response(get_payload(request.query))
+
+        path = fixtures / get_fixture_name(request.query)
+        if path.exists():
+            stats['replayed'] += 1
+            return web.json_response(json.loads(path.read_text()))
+        if upstream:
+            stats['recorded'] += 1
+            payload = await record_payload(request.app['session'], upstream, request.query, path)
+            return web.json_response(payload)
+        return web.json_response(get_payload(request.query))
+
+    async def session_context(app):
+        app['session'] = ClientSession()
+        yield
+        await app['session'].close()
+
+    app = web.Application()
+    app['stats'] = stats
+    app.router.add_get('/', handle)
+    if fixtures is not None and upstream:
+        fixtures.mkdir(parents=True, exist_ok=True)
+        app.cleanup_ctx.append(session_context)
+    return app
+
+
+class FakeOmdbServer:
+    """
+        Runs the stand-in on its own thread and event loop,
+        so it can serve sync code of tests and benchmarks
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, **options):
+        self.host = host
+        self.port = port
+        self.app = make_app(**options)
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(self.app)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/'
+
+    @property
+    def stats(self):
+        return self.app['stats']
+
+    def start(self):
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, self.host, self.port)
+        self.loop.run_until_complete(site.start())
+        self.port = self.runner.addresses[0][1]
+        self.thread.start()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
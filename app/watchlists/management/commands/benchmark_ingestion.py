@@ -0,0 +1,62 @@
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from watchlists.fake_omdb import FakeOmdbServer, get_series_id
+from watchlists.services import db_saving
+
+
+class Command(BaseCommand):
+    help = 'Measures save_movie and save_series against local OMDb stand-in, saved rows are rolled back'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--episodes', type=int, default=10, help='Episodes per season')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every OMDb response')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of OMDb responses with 503 status')
+
+    def handle(self, *args, **options):
+        server = FakeOmdbServer(latency=options['latency'], error_rate=options['error_rate'], seed=0).start()
+        cases = [('save_movie', 'tt6000001', db_saving.save_movie)] + [
+            (f'save_series {total_seasons}x{options["episodes"]}', get_series_id(total_seasons, options['episodes']), db_saving.save_series)
+            for total_seasons in options['seasons']
+        ]
+
+        self.stdout.write(f'{"case":<24}{"wall, s":>10}{"queries":>10}{"http":>8}{"peak, MiB":>12}')
+        try:
+            # own keys keep the stand-in out of cached responses and daily quota of real OMDb
+            with override_settings(
+                OMDB_BASE_URL=server.url, OMDB_KEY_PREFIX='benchmark:omdb', OMDB_RATE=10 ** 6, OMDB_BURST=10 ** 6
+            ):
+                for name, imdb_id, save in cases:
+                    result = self.measure(server, imdb_id, save)
+                    self.stdout.write(
+                        f'{name:<24}{result["wall"]:>10.3f}{result["queries"]:>10}'
+                        f'{result["http"]:>8}{result["peak"] / 2 ** 20:>12.2f}'
+                    )
+        finally:
+            server.stop()
+
+    def measure(self, server, imdb_id, save):
+        cache.delete_pattern(f'{settings.OMDB_KEY_PREFIX}:*')
+        served = server.stats['requests']
+        with transaction.atomic():
+            tracemalloc.start()
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                save(imdb_id)
+            wall = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            transaction.set_rollback(True)
+        return {
+            'wall': wall,
+            'queries': len(queries),
+            'http': server.stats['requests'] - served,
+            'peak': peak,
+        }
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from watchlists.services import prefetching
+from watchlists.tasks import prefetch_media
+
+
+class Command(BaseCommand):
+    help = 'Imports media with given imdb ids ahead of user requests, already saved ones are skipped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('imdb_ids', nargs='*')
+        parser.add_argument('--file', help='File with one imdb id per line')
+        parser.add_argument('--concurrency', type=int, default=None)
+        parser.add_argument('--in-background', action='store_true', help='Enqueue Celery task instead of importing here')
+
+    def handle(self, *args, **options):
+        imdb_ids = list(options['imdb_ids'])
+        if options['file']:
+            with open(options['file']) as file:
+                imdb_ids += [line.strip() for line in file if line.strip()]
+        if not imdb_ids:
+            raise CommandError('Pass imdb ids or --file')
+
+        if options['in_background']:
+            result = prefetch_media.delay(imdb_ids)
+            self.stdout.write(f'Prefetch of {len(imdb_ids)} media is enqueued as {result.id}')
+            return
+
+        def on_progress(done, total):
+            self.stdout.write(f'{done}/{total} processed')
+
+        report = prefetching.prefetch_media(imdb_ids, options['concurrency'], on_progress)
+        self.stdout.write(
+            f'Imported: {len(report.imported)}, skipped: {len(report.skipped)}, failed: {len(report.failed)}'
+        )
+        for imdb_id, error in report.failed:
+            self.stderr.write(f'{imdb_id}: {error}')
@@ -0,0 +1,30 @@
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from watchlists.fake_omdb import make_app
+
+
+class Command(BaseCommand):
+    help = 'Runs local OMDb stand-in, point OMDB_BASE_URL to it to work offline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Up to that many seconds added at random')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of responses with 503 status')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--fixtures', default=None, help='Directory of recorded responses to replay')
+        parser.add_argument('--record-from', default=None, help='OMDb url with apikey to record missing fixtures from')
+
+    def handle(self, *args, **options):
+        app = make_app(
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            seed=options['seed'],
+            fixtures=options['fixtures'],
+            upstream=options['record_from'],
+        )
+        self.stdout.write(f'Fake OMDb is listening on http://{options["host"]}:{options["port"]}/')
+        web.run_app(app, host=options['host'], port=options['port'], print=None)
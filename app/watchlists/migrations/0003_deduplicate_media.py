@@ -0,0 +1,62 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def deduplicate_media(apps, schema_editor):
+    """
+        Keeps the most recently retrieved media of every
+        (imdb_id, media_type) pair, moves reviews, discussions
+        and favourites of its duplicates to it and deletes
+        duplicates with their seasons and episodes
+    """
+
+    Media = apps.get_model('watchlists', 'Media')
+    Season = apps.get_model('watchlists', 'Season')
+    Episode = apps.get_model('watchlists', 'Episode')
+    Review = apps.get_model('reviews', 'Review')
+    Discussion = apps.get_model('discussions', 'Discussion')
+    Favourite = apps.get_model('users', 'UserProfile').favourites.through
+
+    duplicates = Media.objects \
+        .values('imdb_id', 'media_type') \
+        .annotate(count=Count('id')) \
+        .filter(count__gt=1)
+    for duplicate in duplicates.iterator():
+        media_ids = list(
+            Media.objects
+            .filter(imdb_id=duplicate['imdb_id'], media_type=duplicate['media_type'])
+            .order_by('-last_retrieved', 'id')
+            .values_list('id', flat=True)
+        )
+        kept, removed = media_ids[0], media_ids[1:]
+
+        Review.objects.filter(media_id__in=removed).update(media_id=kept)
+        Discussion.objects.filter(media_id__in=removed).update(media_id=kept)
+
+        profiles = set(Favourite.objects.filter(media_id=kept).values_list('userprofile_id', flat=True))
+        for favourite in Favourite.objects.filter(media_id__in=removed):
+            if favourite.userprofile_id in profiles:
+                favourite.delete()
+            else:
+                profiles.add(favourite.userprofile_id)
+                favourite.media_id = kept
+                favourite.save()
+
+        seasons = Season.objects.filter(media__id__in=removed)
+        Episode.objects.filter(season__in=seasons).delete()
+        seasons.delete()
+        Media.objects.filter(id__in=removed).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0002_rename_seasons_season_episodes'),
+        ('reviews', '0002_alter_review_user_alter_reviewlikes_user'),
+        ('discussions', '0003_alter_comment_user'),
+        ('users', '0003_alter_userprofile_favourites_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_media, migrations.RunPython.noop),
+    ]
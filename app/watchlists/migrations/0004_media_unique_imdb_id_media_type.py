@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0003_deduplicate_media'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='media',
+            constraint=models.UniqueConstraint(fields=('imdb_id', 'media_type'), name='unique_media_imdb_id_media_type'),
+        ),
+    ]
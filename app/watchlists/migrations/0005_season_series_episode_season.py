@@ -0,0 +1,22 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0004_media_unique_imdb_id_media_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='series',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='watchlists.media'),
+        ),
+        migrations.AddField(
+            model_name='episode',
+            name='season',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='watchlists.season'),
+        ),
+    ]
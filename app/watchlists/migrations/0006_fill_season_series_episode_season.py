@@ -0,0 +1,72 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def copy_relations(model, through, child_field, parent_field, foreign_key):
+    """
+        Moves rows of M2M table to foreign key of the child
+        model, batches are taken by the through table id
+    """
+
+    last_id = 0
+    while True:
+        rows = list(
+            through.objects
+            .filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', child_field, parent_field)[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        model.objects.bulk_update(
+            [model(id=child_id, **{foreign_key: parent_id}) for _, child_id, parent_id in rows],
+            [foreign_key],
+        )
+        last_id = rows[-1][0]
+
+
+def fill_foreign_keys(apps, schema_editor):
+    Media = apps.get_model('watchlists', 'Media')
+    Season = apps.get_model('watchlists', 'Season')
+    Episode = apps.get_model('watchlists', 'Episode')
+
+    copy_relations(Season, Media.seasons.through, 'season_id', 'media_id', 'series_id')
+    copy_relations(Episode, Season.episodes.through, 'episode_id', 'season_id', 'season_id')
+
+    # seasons and episodes not attached to anything are unreachable
+    Episode.objects.filter(season__isnull=True).delete()
+    Season.objects.filter(series__isnull=True).delete()
+
+
+def fill_many_to_many(apps, schema_editor):
+    Media = apps.get_model('watchlists', 'Media')
+    Season = apps.get_model('watchlists', 'Season')
+    Episode = apps.get_model('watchlists', 'Episode')
+
+    Media.seasons.through.objects.bulk_create(
+        (
+            Media.seasons.through(media_id=series_id, season_id=season_id)
+            for season_id, series_id in Season.objects.values_list('id', 'series_id').iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Season.episodes.through.objects.bulk_create(
+        (
+            Season.episodes.through(season_id=season_id, episode_id=episode_id)
+            for episode_id, season_id in Episode.objects.values_list('id', 'season_id').iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0005_season_series_episode_season'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_foreign_keys, fill_many_to_many),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0006_fill_season_series_episode_season'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='media',
+            name='seasons',
+        ),
+        migrations.RemoveField(
+            model_name='season',
+            name='episodes',
+        ),
+        migrations.AlterField(
+            model_name='season',
+            name='series',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='watchlists.media'),
+        ),
+        migrations.AlterField(
+            model_name='episode',
+            name='season',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='episodes', to='watchlists.season'),
+        ),
+        migrations.AddIndex(
+            model_name='season',
+            index=models.Index(fields=['series', 'season_numb'], name='season_series_numb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='episode',
+            index=models.Index(fields=['season', 'episode_numb'], name='episode_season_numb_idx'),
+        ),
+    ]
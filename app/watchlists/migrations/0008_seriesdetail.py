@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0007_remove_media_seasons_remove_season_episodes_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesDetail',
+            fields=[
+                ('series', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='detail', serialize=False, to='watchlists.media')),
+                ('seasons', models.JSONField(default=list)),
+                ('built', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Series detail',
+                'verbose_name_plural': 'Series details',
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 100
+
+EPISODE_FIELDS = ['title', 'released', 'episode_numb', 'runtime', 'plot', 'poster', 'imdb_rating']
+
+
+def serialize_seasons(Season, Episode, series_id):
+    """
+        Builds the same document as SeasonSerializer does,
+        serializer itself can't be used with historical models
+    """
+
+    seasons = list(Season.objects.filter(series_id=series_id).order_by('season_numb').values('id', 'season_numb', 'total_episodes'))
+    episodes = {season['id']: [] for season in seasons}
+    for episode in Episode.objects.filter(season__series_id=series_id).order_by('episode_numb').values('season_id', *EPISODE_FIELDS):
+        season_id = episode.pop('season_id')
+        episode['released'] = episode['released'].isoformat()
+        episodes[season_id].append(episode)
+    return [
+        {'season_numb': season['season_numb'], 'total_episodes': season['total_episodes'], 'episodes': episodes[season['id']]}
+        for season in seasons
+    ]
+
+
+def build_missing_series_details(apps, schema_editor):
+    """
+        Series imported before detail documents existed are complete,
+        once they have documents a series without one is an unfinished import
+    """
+
+    Media = apps.get_model('watchlists', 'Media')
+    Season = apps.get_model('watchlists', 'Season')
+    Episode = apps.get_model('watchlists', 'Episode')
+    SeriesDetail = apps.get_model('watchlists', 'SeriesDetail')
+
+    series_ids = Media.objects \
+        .filter(media_type='SERIES', detail__isnull=True) \
+        .order_by('id') \
+        .values_list('id', flat=True)
+    last_id = None
+    while True:
+        batch = series_ids if last_id is None else series_ids.filter(id__gt=last_id)
+        batch = list(batch[:BATCH_SIZE])
+        if not batch:
+            break
+        SeriesDetail.objects.bulk_create(
+            SeriesDetail(series_id=series_id, seasons=serialize_seasons(Season, Episode, series_id))
+            for series_id in batch
+        )
+        last_id = batch[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('watchlists', '0008_seriesdetail'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_missing_series_details, migrations.RunPython.noop),
+    ]
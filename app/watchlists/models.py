@@ -29,7 +29,11 @@ class Media(models.Model):
     # only series
     total_seasons = models.PositiveIntegerField(null=True, blank=True)
     year = models.CharField(max_length=9, help_text='Use such format: 2018-2022', null=True, blank=True)
-    seasons = models.ManyToManyField('Season')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['imdb_id', 'media_type'], name='unique_media_imdb_id_media_type'),
+        ]
 
     def __str__(self):
         return self.title
@@ -59,14 +63,18 @@ class Series(Media):
 
 class Season(models.Model):
     id = models.UUIDField(primary_key=True, unique=True, default=uuid.uuid4, editable=False)
+    # indexed by the composite index below
+    series = models.ForeignKey(Media, on_delete=models.CASCADE, related_name='seasons', db_index=False)
     season_numb = models.PositiveIntegerField()
     total_episodes = models.PositiveIntegerField()
-    episodes = models.ManyToManyField('Episode')
 
     class Meta:
         verbose_name = _('Season')
         verbose_name_plural = _('Seasons')
         ordering = ['season_numb']
+        indexes = [
+            models.Index(fields=['series', 'season_numb'], name='season_series_numb_idx'),
+        ]
 
     def __str__(self):
         return f'{self.season_numb}'
@@ -74,6 +82,8 @@ class Season(models.Model):
 
 class Episode(models.Model):
     id = models.UUIDField(primary_key=True, unique=True, default=uuid.uuid4, editable=False)
+    # indexed by the composite index below
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='episodes', db_index=False)
     title = models.CharField(max_length=50)
     released = models.DateField()
     episode_numb = models.PositiveIntegerField()
@@ -86,6 +96,26 @@ class Episode(models.Model):
         verbose_name = _('Episode')
         verbose_name_plural = _('Episodes')
         ordering = ['episode_numb']
+        indexes = [
+            models.Index(fields=['season', 'episode_numb'], name='episode_season_numb_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class SeriesDetail(models.Model):
+    """
+        Seasons and episodes of series serialized at import
+        and refresh time, so reads don't walk the ORM objects
+    """
+    series = models.OneToOneField(Media, on_delete=models.CASCADE, primary_key=True, related_name='detail')
+    seasons = models.JSONField(default=list)
+    built = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Series detail')
+        verbose_name_plural = _('Series details')
+
+    def __str__(self):
+        return f'{self.series_id}'
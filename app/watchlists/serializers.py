@@ -1,8 +1,6 @@
-import re
-
-from django.core.paginator import Paginator
 from rest_framework import serializers
 
+from base.pagination import paginate_by_cursor, is_count_requested
 from reviews.serializers import ReviewSerializer
 from watchlists.models import (Media, Movie, Series, Season, Episode)
 
@@ -21,38 +19,14 @@ class MovieSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'runtime', 'released', 'genres', 'poster', 'imdb_rating', 'reviews']
 
     def get_paginated_reviews(self, obj):
-        page_size = self.context['request'].query_params.get('size', 5)
-        page_number = self.context['request'].query_params.get('page', 1)
-        full_path = self.context['request'].get_full_path()
-        url_without_page_query_param = re.sub(r'&page=\d+', '', full_path)
-        url_without_page_and_size_query_params = re.sub(r'&size=\d*', '', url_without_page_query_param)
-        paginator = Paginator(obj.reviews.all(), page_size)
-        page = self.get_page(paginator, page_size, page_number, url_without_page_and_size_query_params)
-        return page
-
-    def get_page(self, paginator, page_size, page_number, url):
-        context = {'request': self.context['request']}
-        page_obj = paginator.page(page_number)
-        page = {
-            'count': paginator.count,
-            'next': self.get_next_link(url, page_size, page_obj),
-            'previous': self.get_previous_link(url, page_size, page_obj),
-            'results': ReviewSerializer(page_obj, many=True, context=context).data
-        }
+        request = self.context['request']
+        reviews = obj.reviews.with_current_user_reviewlike(request.user)
+        page = paginate_by_cursor(reviews, request)
+        page['results'] = ReviewSerializer(page['results'], many=True, context={'request': request}).data
+        if is_count_requested(request):
+            page['count'] = obj.reviews.count()
         return page
 
-    @staticmethod
-    def get_next_link(url, page_size, page_obj):
-        if page_obj.has_next():
-            return f'{url}&size={page_size}&page={page_obj.next_page_number()}'
-        return None
-
-    @staticmethod
-    def get_previous_link(url, page_size, page_obj):
-        if page_obj.has_previous():
-            return f'{url}&size={page_size}&page={page_obj.previous_page_number()}'
-        return None
-
 
 class EpisodeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -68,13 +42,8 @@ class SeasonSerializer(serializers.ModelSerializer):
         fields = ['season_numb', 'total_episodes', 'episodes']
 
     def get_episodes(self, instance):
-        print(self.context)
-        imdb_rating = self.context["imdb_rating"]
-        if imdb_rating is not None:
-            episodes = instance.episodes.all().filter(imdb_rating__gte=imdb_rating)
-        else:
-            episodes = instance.episodes.all()
-        return EpisodeSerializer(episodes, many=True).data
+        # episodes are expected to be prefetched, filtered by imdb_rating if needed
+        return EpisodeSerializer(instance.episodes.all(), many=True).data
 
 
 class SeriesSerializer(MovieSerializer):
@@ -86,6 +55,19 @@ class SeriesSerializer(MovieSerializer):
         depth = 1
 
     def get_seasons(self, instance):
-        seasons = instance.seasons.all()
-
-        return SeasonSerializer(seasons, many=True, context=self.context).data
+        # documents of all series are built at import, refresh and by migration 0009
+        seasons = instance.detail.seasons
+        imdb_rating = self.context['imdb_rating']
+        if not imdb_rating:
+            return seasons
+        imdb_rating = float(imdb_rating)
+        return [
+            {
+                **season,
+                'episodes': [
+                    episode for episode in season['episodes']
+                    if episode['imdb_rating'] is not None and episode['imdb_rating'] >= imdb_rating
+                ],
+            }
+            for season in seasons
+        ]
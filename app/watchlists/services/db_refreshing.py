@@ -0,0 +1,129 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from base.cache import invalidate, get_media_tag
+from watchlists.models import Media, Episode
+from watchlists.services import ingestion, omdb_requests as req, rate_limiter, series_detail
+from watchlists.services.db_saving import save_episodes, save_seasons
+
+
+logger = logging.getLogger(__name__)
+
+REFRESHED_FIELDS = ['imdb_rating', 'poster', 'plot', 'runtime', 'total_seasons', 'year', 'last_retrieved']
+
+
+def refresh_stale_media():
+    """
+        Refreshes media retrieved more than MEDIA_REFRESH_AGE days ago,
+        the oldest go first, returns number of refreshed media
+    """
+
+    today = datetime.date.today()
+    # unfinished imports have no detail document, a refresh must not build one for them
+    stale_media = Media.objects \
+        .filter(last_retrieved__lt=today - datetime.timedelta(days=settings.MEDIA_REFRESH_AGE)) \
+        .exclude(media_type=Media.MediaTypes.SERIES, detail__isnull=True) \
+        .order_by('last_retrieved')[:settings.MEDIA_REFRESH_BATCH_SIZE]
+
+    refreshed = []
+    failed = []
+    for media in stale_media:
+        try:
+            refresh_media(media)
+        except rate_limiter.OmdbBudgetExceeded:
+            # the rest of the batch is untouched, it is picked up once the quota renews
+            logger.warning(f'OMDb budget is exceeded, refreshing stopped at {media.imdb_id}')
+            break
+        except Exception as e:
+            logger.error(f'Refreshing of {media.imdb_id} failed: {e}')
+            # pushed back by a whole refresh age, so failing media can't take the head of every batch
+            media.last_retrieved = today
+            failed.append(media)
+            continue
+        media.last_retrieved = today
+        refreshed.append(media)
+
+    Media.objects.bulk_update(refreshed, REFRESHED_FIELDS)
+    Media.objects.bulk_update(failed, ['last_retrieved'])
+    # bulk_update sends no signals
+    invalidate(*(get_media_tag(media.imdb_id) for media in refreshed))
+    logger.info(f'{len(refreshed)} stale media were refreshed')
+    return len(refreshed)
+
+
+def refresh_media(media):
+    """
+        Applies fresh OMDb data to the media instance without saving it,
+        new seasons and episodes of ongoing series are saved right away
+    """
+
+    media_data = req.get_omdb_by_omdbid(media.imdb_id)
+    known_seasons = media.total_seasons
+
+    if media_data['imdbRating'] != 'N/A':
+        media.imdb_rating = media_data['imdbRating']
+    media.poster = media_data['Poster']
+    media.plot = media_data['Plot']
+
+    if media.media_type == Media.MediaTypes.MOVIE:
+        runtime = media_data['Runtime'].split(' ')[0]
+        if runtime != 'N/A':
+            media.runtime = runtime
+        return
+
+    media.year = media_data['Year']
+    media.total_seasons = media_data['totalSeasons']
+    ongoing = media.year.endswith(('–', '-'))
+    if ongoing or int(media.total_seasons) > (known_seasons or 0):
+        refresh_seasons(media)
+
+
+def refresh_seasons(series):
+    """
+        Downloads only seasons which may have changed: the last known
+        and new ones, saves their new episodes and updates ratings,
+        failed downloads are picked up by the next refresh
+    """
+
+    seasons = {season.season_numb: season for season in series.seasons.prefetch_related('episodes')}
+    known_episodes = {
+        season_numb: {episode.episode_numb: episode for episode in season.episodes.all()}
+        for season_numb, season in seasons.items()
+    }
+
+    def select_episodes(season_data):
+        known = known_episodes.get(int(season_data['Season']), {})
+        return [episode for episode in season_data['Episodes'] if int(episode['Episode']) not in known]
+
+    new_seasons = []
+    seasons_episodes = []
+    changed_episodes = []
+    season_numbers = range(max(seasons, default=1), int(series.total_seasons) + 1)
+    for season_numb, season_data, episodes in ingestion.iter_seasons(series.imdb_id, season_numbers, select_episodes):
+        if season_data is None:
+            continue
+        season = seasons.get(season_numb)
+        if season is None:
+            new_seasons.append((season_data, episodes.records))
+            continue
+
+        # ratings of known episodes come within season data
+        known = known_episodes[season_numb]
+        for episode_data in season_data['Episodes']:
+            episode = known.get(int(episode_data['Episode']))
+            if episode is None or episode_data['imdbRating'] == 'N/A':
+                continue
+            if episode.imdb_rating != float(episode_data['imdbRating']):
+                episode.imdb_rating = episode_data['imdbRating']
+                changed_episodes.append(episode)
+
+        seasons_episodes.append((season, episodes.records))
+
+    with transaction.atomic():
+        Episode.objects.bulk_update(changed_episodes, ['imdb_rating'])
+        save_episodes(seasons_episodes)
+        save_seasons(series, new_seasons)
+        series_detail.build_series_detail(series)
@@ -1,12 +1,12 @@
-import asyncio
 import datetime
 import logging
 
-import requests
+from django.conf import settings
+from django.db import transaction
 
-from watchlists.services import omdb_requests as req
+from watchlists.services import ingestion, omdb_requests as req, series_detail
+from watchlists.services.single_flight import single_flight
 from watchlists.models import Movie, Series, Season, Episode
-from watchlists.tasks import get_season_data, get_episode_data
 
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,8 @@ logger = logging.getLogger(__name__)
 
 def save_movie(imdb_id):
     """
-        Creates movie and returns it
+        Creates movie and returns it,
+        returns existing one if it is already saved
     """
 
     movie_data = req.get_omdb_by_omdbid(imdb_id)
@@ -26,20 +27,20 @@ def save_movie(imdb_id):
     needed_data['runtime'] = movie_data['Runtime'].split(' ')[0]
     needed_data['genres'] = movie_data['Genre']
     needed_data['poster'] = movie_data['Poster']
-    needed_data['imdb_id'] = movie_data['imdbID']
     needed_data['imdb_rating'] = movie_data['imdbRating']
     needed_data['last_retrieved'] = datetime.datetime.today().date() - datetime.timedelta(days=1)
 
-    movie = Movie(**needed_data)
-    movie.save()
+    # unique (imdb_id, media_type) makes concurrent import return the saved movie
+    movie, _ = Movie.objects.get_or_create(imdb_id=movie_data['imdbID'], defaults=needed_data)
 
     return movie
 
 
-def save_series(imdb_id):
+def save_series(imdb_id, on_progress=None):
     """
-        At first saves series then iterated through
-        season and episodes and saves them too,
+        At first saves series then saves its seasons
+        and episodes in batches while they are downloading,
+        reports downloaded seasons and episodes to on_progress,
         returns series instance
     """
 
@@ -56,60 +57,216 @@ def save_series(imdb_id):
     needed_data['plot'] = series_data['Plot']
     needed_data['total_seasons'] = series_data['totalSeasons']
     needed_data['poster'] = series_data['Poster']
-    needed_data['imdb_id'] = series_data['imdbID']
     needed_data['imdb_rating'] = series_data['imdbRating']
 
-    series = Series(**needed_data)
-    series.save()
+    # series without detail document was left by an interrupted import, it is imported again
+    Series.objects.filter(imdb_id=series_data['imdbID'], detail__isnull=True).delete()
+    # series saved by concurrent import is returned as is
+    series, created = Series.objects.get_or_create(imdb_id=series_data['imdbID'], defaults=needed_data)
+    if not created:
+        return series
 
-    # prepare data for seasons
-    series_data = (series.imdb_id, series.total_seasons)
-    seasons = get_season_data.delay(series_data).get()
-    seasons_all = []
+    # no transaction is held open while downloading, every batch is committed on its own
+    try:
+        season_numbers = range(1, int(series.total_seasons) + 1)
+        downloads = ingestion.iter_seasons(series.imdb_id, season_numbers)
+        failed_seasons, failed_episodes = save_downloaded_seasons(series, downloads, on_progress)
+    except Exception:
+        # half imported series is not kept, so the next request imports it again
+        series.delete()
+        raise
+
+    # series without detail document is not returned by get_or_save_series yet
+    with transaction.atomic():
+        series.save()
+        series_detail.build_series_detail(series)
+        if failed_seasons or failed_episodes:
+            schedule_retry(series, failed_seasons, failed_episodes)
+
+    return series
+
+
+def save_downloaded_seasons(series, downloads, on_progress=None):
+    """
+        Saves seasons in batches while the rest is still downloading,
+        returns numbers of failed seasons and failed episodes by season
+    """
+
+    failed_seasons = []
+    failed_episodes = []
+    seasons_batch = []
+    episodes_in_batch = 0
+    seasons_downloaded = episodes_downloaded = 0
+    for season_numb, season_data, episodes in downloads:
+        if season_data is None:
+            failed_seasons.append(season_numb)
+            continue
+        if episodes.failed:
+            failed_episodes.append([season_numb, episodes.failed])
+
+        seasons_batch.append((season_data, episodes.records))
+        episodes_in_batch += len(episodes.records)
+        seasons_downloaded += 1
+        episodes_downloaded += len(episodes.records)
+        if on_progress is not None:
+            on_progress(seasons_downloaded, episodes_downloaded)
+        if episodes_in_batch >= settings.INGESTION_BATCH_SIZE:
+            save_seasons(series, seasons_batch)
+            seasons_batch = []
+            episodes_in_batch = 0
+    if seasons_batch:
+        save_seasons(series, seasons_batch)
+
+    return failed_seasons, failed_episodes
+
+
+def schedule_retry(series, failed_seasons, failed_episodes, attempt=1):
+    """
+        Schedules download of failed seasons and episodes
+        once the current transaction is committed
+    """
+
+    from watchlists.tasks import retry_failed_downloads
+
+    episodes_count = sum(len(episodes) for _, episodes in failed_episodes)
+    logger.warning(
+        f'{len(failed_seasons)} seasons and {episodes_count} episodes of {series.imdb_id} '
+        f'failed to download, retry #{attempt} is scheduled'
+    )
+    transaction.on_commit(lambda: retry_failed_downloads.apply_async(
+        (str(series.id), failed_seasons, failed_episodes, attempt),
+        countdown=settings.INGESTION_RETRY_DELAY * 2 ** (attempt - 1),
+    ))
+
+
+def save_failed_downloads(series_id, failed_seasons, failed_episodes, attempt):
+    """
+        Downloads again seasons and episodes which failed during
+        import, schedules next retry for the ones failed again
+    """
+
+    series = Series.objects.get(id=series_id)
+    downloads = ingestion.iter_seasons(series.imdb_id, failed_seasons)
+    still_failed_seasons, still_failed_episodes = save_downloaded_seasons(series, downloads)
+
+    season_numbers = [season_numb for season_numb, _ in failed_episodes]
+    seasons = {season.season_numb: season for season in series.seasons.filter(season_numb__in=season_numbers)}
+    seasons_episodes = []
+    for season_numb, episodes in failed_episodes:
+        episodes = ingestion.fetch_episodes(episodes)
+        if episodes.failed:
+            still_failed_episodes.append([season_numb, episodes.failed])
+        seasons_episodes.append((seasons[season_numb], episodes.records))
+
+    with transaction.atomic():
+        save_episodes(seasons_episodes)
+        series_detail.build_series_detail(series)
+        if still_failed_seasons or still_failed_episodes:
+            if attempt < settings.INGESTION_RETRY_ATTEMPTS:
+                schedule_retry(series, still_failed_seasons, still_failed_episodes, attempt + 1)
+            else:
+                logger.error(f'Download of {series.imdb_id} is incomplete after {attempt} retries')
 
-    for season_data in seasons:
 
+@transaction.atomic
+def save_seasons(series, seasons_data):
+    """
+        Saves downloaded seasons with their episodes
+        in constant number of queries
+    """
+
+    seasons_all = []
+    episodes_all = []
+    for season_data, episodes_data in seasons_data:
         # extracting data for season
         needed_data = {}
+        needed_data['series'] = series
         needed_data['season_numb'] = season_data['Season']
-        needed_data['total_episodes'] = 0
+        needed_data['total_episodes'] = len(episodes_data)
 
         season = Season(**needed_data)
-        season.save()
         seasons_all.append(season)
+        episodes_all.extend(parse_episode(episode_data, season) for episode_data in episodes_data)
+
+    Season.objects.bulk_create(seasons_all)
+    Episode.objects.bulk_create(episodes_all)
+
 
-        # prepare data for episodes
-        episodes = season_data['Episodes']
-        episodes = get_episode_data.delay(episodes).get()
-        episodes_all = []
+@transaction.atomic
+def save_episodes(seasons_episodes):
+    """
+        Adds downloaded episodes to already saved seasons
+        in constant number of queries
+    """
 
-        for episode_data in episodes:
+    episodes_all = []
+    changed_seasons = []
+    for season, episodes_data in seasons_episodes:
+        if not episodes_data:
+            continue
+        episodes_all.extend(parse_episode(episode_data, season) for episode_data in episodes_data)
+        season.total_episodes += len(episodes_data)
+        changed_seasons.append(season)
 
-            # extracting data for episode
-            needed_data = {}
-            needed_data['title'] = episode_data['Title']
-            needed_data['released'] = datetime.datetime.strptime(episode_data['Released'], '%d %b %Y').date()
-            needed_data['episode_numb'] = episode_data['Episode']
-            needed_data['plot'] = episode_data['Plot']
-            needed_data['poster'] = episode_data['Poster']
+    Episode.objects.bulk_create(episodes_all)
+    Season.objects.bulk_update(changed_seasons, ['total_episodes'])
 
-            imdb_rating = episode_data['imdbRating']
-            if imdb_rating not in ["N/A"]:
-                needed_data['imdb_rating'] = imdb_rating
 
-            runtime = episode_data['Runtime'].split(" ")[0]
-            if runtime not in ["N/A"]:
-                needed_data['runtime'] = runtime
+def parse_episode(episode_data, season):
+    """
+        Extracts episode fields from OMDb payload
+    """
 
-            episode = Episode(**needed_data)
-            episodes_all.append(episode)
+    needed_data = {}
+    needed_data['season'] = season
+    needed_data['title'] = episode_data['Title']
+    needed_data['released'] = datetime.datetime.strptime(episode_data['Released'], '%d %b %Y').date()
+    needed_data['episode_numb'] = episode_data['Episode']
+    needed_data['plot'] = episode_data['Plot']
+    needed_data['poster'] = episode_data['Poster']
 
-        Episode.objects.bulk_create(episodes_all)
-        season.total_episodes += len(episodes_all)
-        season.episodes.add(*episodes_all)
+    imdb_rating = episode_data['imdbRating']
+    if imdb_rating not in ["N/A"]:
+        needed_data['imdb_rating'] = imdb_rating
 
-    [season.save() for season in seasons_all]
-    series.seasons.add(*seasons_all)
-    series.save()
+    runtime = episode_data['Runtime'].split(" ")[0]
+    if runtime not in ["N/A"]:
+        needed_data['runtime'] = runtime
 
-    return series
+    return Episode(**needed_data)
+
+
+def get_or_save_movie(imdb_id):
+    """
+        Returns movie from db, imports it once
+        even if requested concurrently
+    """
+
+    return single_flight(
+        f'movie:{imdb_id}',
+        lookup=lambda: Movie.objects.filter(imdb_id=imdb_id).first(),
+        create=lambda keep_alive: save_movie(imdb_id),
+    )
+
+
+def get_or_save_series(imdb_id, on_progress=None):
+    """
+        Returns series with its detail document,
+        imports it once even if requested concurrently
+    """
+
+    def create(keep_alive):
+        def report_progress(seasons_downloaded, episodes_downloaded):
+            # import of a long series outlives IMPORT_LOCK_TIMEOUT, every season renews the lock
+            keep_alive()
+            if on_progress is not None:
+                on_progress(seasons_downloaded, episodes_downloaded)
+
+        return save_series(imdb_id, report_progress)
+
+    return single_flight(
+        f'series:{imdb_id}',
+        # series is saved before its seasons, it is complete once its detail document is built
+        lookup=lambda: Series.objects.select_related('detail').filter(imdb_id=imdb_id, detail__isnull=False).first(),
+        create=create,
+    )
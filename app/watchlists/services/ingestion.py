@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from watchlists.services import omdb_requests
+from watchlists.services.omdb_client import omdb_client
+
+
+logger = logging.getLogger(__name__)
+
+SEASON_EPISODE_FIELDS = ('Episode', 'imdbID', 'imdbRating')
+EPISODE_FIELDS = ('Response', 'Title', 'Released', 'Episode', 'Plot', 'Poster', 'imdbRating', 'Runtime')
+
+
+@dataclass
+class FetchResult:
+    """Downloaded payloads and requests which failed after all retries"""
+    records: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def split_responses(requested, responses):
+    result = FetchResult()
+    for request, response in zip(requested, responses):
+        if isinstance(response, Exception):
+            logger.warning(f'OMDb request for {request} failed: {response!r}')
+            result.failed.append(request)
+        elif response.get('Response') != 'True':
+            logger.warning(f'OMDb request for {request} failed: {response.get("Error")}')
+            result.failed.append(request)
+        else:
+            result.records.append(response)
+    return result
+
+
+def project_season(season_data):
+    """Keeps only fields used to save season and to pick its episodes"""
+    return {
+        'Response': season_data['Response'],
+        'Season': season_data['Season'],
+        'Episodes': [
+            {field: episode.get(field, 'N/A') for field in SEASON_EPISODE_FIELDS}
+            for episode in season_data.get('Episodes', [])
+        ],
+    }
+
+
+def project_episode(episode_data):
+    """Keeps only fields read by parse_episode"""
+    return {field: episode_data.get(field, 'N/A') for field in EPISODE_FIELDS}
+
+
+async def download_seasons(imdb_id, season_numbers, semaphore) -> FetchResult:
+    params_list = [{'i': imdb_id, 'Season': season_numb} for season_numb in season_numbers]
+    seasons = await omdb_requests.afetch_many('season', params_list, semaphore, project_season)
+    return split_responses(season_numbers, seasons)
+
+
+async def download_episodes(episodes, semaphore) -> FetchResult:
+    params_list = [{'i': episode['imdbID']} for episode in episodes]
+    responses = await omdb_requests.afetch_many('id', params_list, semaphore, project_episode)
+    return split_responses(episodes, responses)
+
+
+async def download_series(queue, imdb_id, season_numbers, select_episodes=None):
+    """
+        Downloads given seasons and their episodes concurrently,
+        number of requests in flight is capped by semaphore,
+        select_episodes narrows down episodes to download,
+        puts each finished season to the queue
+    """
+
+    semaphore = asyncio.Semaphore(settings.INGESTION_CONCURRENCY)
+
+    async def download_season(season_numb):
+        seasons = await download_seasons(imdb_id, [season_numb], semaphore)
+        if seasons.failed:
+            await queue.put((season_numb, None, None))
+            return
+        season_data, = seasons.records
+        episodes = season_data['Episodes'] if select_episodes is None else select_episodes(season_data)
+        await queue.put((season_numb, season_data, await download_episodes(episodes, semaphore)))
+
+    try:
+        await asyncio.gather(*(download_season(season_numb) for season_numb in season_numbers))
+    finally:
+        queue.put_nowait(None)
+
+
+def iter_seasons(imdb_id, season_numbers, select_episodes=None):
+    """
+        Yields (season_numb, season_data, episodes) as soon as season
+        is downloaded, other seasons keep downloading on the loop
+        while the caller waits for the next one. Season which failed
+        to download comes with None instead of data and episodes
+    """
+
+    queue = asyncio.Queue()
+    producer = omdb_client.loop.create_task(download_series(queue, imdb_id, season_numbers, select_episodes))
+    try:
+        while (item := omdb_client.run(queue.get())) is not None:
+            yield item
+        omdb_client.run(producer)
+    finally:
+        if not producer.done():
+            producer.cancel()
+            omdb_client.run(asyncio.gather(producer, return_exceptions=True))
+
+
+def fetch_episodes(episodes) -> FetchResult:
+    """Sync counterpart of download_episodes"""
+    semaphore = asyncio.Semaphore(settings.INGESTION_CONCURRENCY)
+    return omdb_client.run(download_episodes(episodes, semaphore))
@@ -0,0 +1,110 @@
+import asyncio
+import atexit
+import os
+import threading
+
+import aiohttp
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from watchlists.services import rate_limiter
+
+
+class OmdbClient:
+    """
+        Long-lived OMDb client shared by the whole services layer.
+        Keeps pooled keep-alive connections for both faces:
+        sync one (requests) for views and async one (aiohttp)
+        for bulk downloads made by ingestion
+    """
+
+    def __init__(self):
+        self._pid = None
+        self._lock = threading.Lock()
+        self._session = None
+        self._local = threading.local()
+
+    def _check_pid(self):
+        # pooled sockets must never be shared between forked workers
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._session = None
+            self._local = threading.local()
+
+    def _params(self, params):
+        return {'apikey': settings.OMDB_API_KEY, **params}
+
+    @property
+    def session(self):
+        self._check_pid()
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.OMDB_POOL_SIZE)
+                    session = requests.Session()
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def loop(self):
+        """Event loop of the current thread, kept alive so the async pool survives between calls"""
+        self._check_pid()
+        if getattr(self._local, 'loop', None) is None:
+            self._local.loop = asyncio.new_event_loop()
+            self._local.async_session = None
+        return self._local.loop
+
+    def _get_async_session(self):
+        if getattr(self._local, 'async_session', None) is None:
+            connector = aiohttp.TCPConnector(
+                limit=settings.OMDB_POOL_SIZE,
+                limit_per_host=settings.OMDB_LIMIT_PER_HOST,
+                keepalive_timeout=settings.OMDB_KEEPALIVE_TIMEOUT,
+            )
+            timeout = aiohttp.ClientTimeout(total=settings.OMDB_TIMEOUT)
+            self._local.async_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._local.async_session
+
+    def get(self, **params) -> dict:
+        rate_limiter.acquire()
+        response = self.session.get(settings.OMDB_BASE_URL, params=self._params(params), timeout=settings.OMDB_TIMEOUT)
+        return response.json()
+
+    async def aget(self, **params) -> dict:
+        await rate_limiter.aacquire()
+        session = self._get_async_session()
+        async with session.get(settings.OMDB_BASE_URL, params=self._params(params)) as response:
+            if response.status >= 500:
+                response.raise_for_status()
+            return await response.json()
+
+    def run(self, coro):
+        """Runs coroutine on the thread's persistent loop, so async connections are reused"""
+        return self.loop.run_until_complete(coro)
+
+    def close_thread(self):
+        """Closes async session and loop of the current thread, the sync session stays shared"""
+        if self._pid != os.getpid():
+            return
+        loop = getattr(self._local, 'loop', None)
+        if loop is not None:
+            if self._local.async_session is not None:
+                loop.run_until_complete(self._local.async_session.close())
+            loop.close()
+            self._local.loop = None
+            self._local.async_session = None
+
+    def close(self):
+        if self._pid != os.getpid():
+            return
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self.close_thread()
+
+
+omdb_client = OmdbClient()
+atexit.register(omdb_client.close)
@@ -1,34 +1,111 @@
-import os
-
-import requests
+import asyncio
+import hashlib
+import random
 
+import aiohttp
+from django.conf import settings
+from django.core.cache import cache
 from django.http import Http404
 
+from watchlists.services.omdb_client import omdb_client
+
+
+RETRYABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def get_cache_key(endpoint: str, params: dict) -> str:
+    """
+        Builds cache key from normalized query, so lookups
+        differing only in case or whitespace share one entry
+    """
+    normalized = sorted(
+        (name.lower(), ' '.join(str(value).split()).lower())
+        for name, value in params.items() if value not in (None, '')
+    )
+    digest = hashlib.md5(repr(normalized).encode()).hexdigest()
+    return f'{settings.OMDB_KEY_PREFIX}:{endpoint}:{digest}'
+
+
+def fetch(endpoint: str, **params) -> dict:
+    """
+        Read-through cached OMDb lookup, only successful
+        responses are stored with TTL of the endpoint type
+    """
+    key = get_cache_key(endpoint, params)
+    data = cache.get(key)
+    if data is None:
+        data = omdb_client.get(**params)
+        if data.get('Response') == 'True':
+            cache.set(key, data, settings.OMDB_CACHE_TTL[endpoint])
+    return data
+
+
+def get_backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, settings.OMDB_RETRY_BACKOFF * 2 ** attempt)
+
+
+async def afetch_many(endpoint: str, params_list: list, semaphore: asyncio.Semaphore, project=None) -> list:
+    """
+        Async counterpart of fetch for bulk downloads:
+        serves cached payloads and requests only missing ones,
+        semaphore caps number of requests in flight,
+        transient errors are retried with backoff and
+        requests failed after all retries are returned as exceptions.
+        project reduces successful payload to needed fields as soon
+        as it arrives, projected payloads are cached separately
+    """
+
+    async def aget(params):
+        for attempt in range(settings.OMDB_RETRIES + 1):
+            try:
+                async with semaphore:
+                    data = await omdb_client.aget(**params)
+                if project is not None and data.get('Response') == 'True':
+                    data = project(data)
+                return data
+            except RETRYABLE_ERRORS:
+                if attempt == settings.OMDB_RETRIES:
+                    raise
+                await asyncio.sleep(get_backoff(attempt))
+
+    key_prefix = endpoint if project is None else f'{endpoint}:{project.__name__}'
+    keys = [get_cache_key(key_prefix, params) for params in params_list]
+    data = cache.get_many(keys)
+    missing = {key: params for key, params in zip(keys, params_list) if key not in data}
+    responses = await asyncio.gather(*(aget(params) for params in missing.values()), return_exceptions=True)
+    fetched = dict(zip(missing, responses))
+    succeeded = {
+        key: value for key, value in fetched.items()
+        if not isinstance(value, Exception) and value.get('Response') == 'True'
+    }
+    if succeeded:
+        cache.set_many(succeeded, settings.OMDB_CACHE_TTL[endpoint])
+    data.update(fetched)
+    return [data[key] for key in keys]
+
 
 def get_omdb_by_search(search: str, page, year) -> dict:
-    data = requests.get(f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&s={search}&page={page}&y={year}').json()
+    data = fetch('search', s=search, page=page or 1, y=year)
     return data
 
 
-def get_omdb_by_omdbid(omdb_id: str, session=None):
-    if session:
-        data = session.get(f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={omdb_id}').json()
-    else:
-        data = requests.get(f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={omdb_id}').json()
+def get_omdb_by_omdbid(omdb_id: str) -> dict:
+    data = fetch('id', i=omdb_id)
     if (data['Response'] == 'True'):
         return data
     raise Http404
 
 
-def get_season_by_omdbid(series_omdb_id: str, season_numb: int, session) -> dict:
-    data = session.get(f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={series_omdb_id}&Season={season_numb}').json()
+def get_season_by_omdbid(series_omdb_id: str, season_numb: int) -> dict:
+    data = fetch('season', i=series_omdb_id, Season=season_numb)
     if (data['Response'] == 'True'):
         return data
     raise Http404
 
 
-def get_episode_by_omdbid(episode_omdb_id: str, session) -> dict:
-    data = session.get(f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={episode_omdb_id}').json()
+def get_episode_by_omdbid(episode_omdb_id: str) -> dict:
+    data = fetch('id', i=episode_omdb_id)
     if (data['Response'] == 'True'):
         return data
     raise Http404
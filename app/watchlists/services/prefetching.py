@@ -0,0 +1,85 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connection
+
+from watchlists.models import Media
+from watchlists.services import db_saving, omdb_requests as req
+from watchlists.services.omdb_client import omdb_client
+from watchlists.services.rate_limiter import background_priority
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchReport:
+    """Imdb ids by outcome, failed ones come as [imdb_id, error] pairs"""
+    imported: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def import_media(imdb_id):
+    """
+        Imports media of the type reported by OMDb,
+        runs with background priority not to starve user requests
+    """
+
+    with background_priority():
+        media_type = req.get_omdb_by_omdbid(imdb_id)['Type'].upper()
+        if media_type == Media.MediaTypes.MOVIE:
+            db_saving.get_or_save_movie(imdb_id)
+        elif media_type == Media.MediaTypes.SERIES:
+            db_saving.get_or_save_series(imdb_id)
+        else:
+            raise ValueError(f'Unsupported media type {media_type}')
+
+
+def import_media_in_thread(imdb_id):
+    try:
+        import_media(imdb_id)
+    finally:
+        # every worker thread opens its own connection, event loop and async session
+        omdb_client.close_thread()
+        connection.close()
+
+
+def prefetch_media(imdb_ids, concurrency=None, on_progress=None) -> PrefetchReport:
+    """
+        Imports media which are not in db yet, up to concurrency
+        at a time, on_progress(done, total) is called after each one
+    """
+
+    imdb_ids = list(dict.fromkeys(imdb_ids))
+    concurrency = concurrency or settings.PREFETCH_CONCURRENCY
+    existing = set(Media.objects.filter(imdb_id__in=imdb_ids).values_list('imdb_id', flat=True))
+    report = PrefetchReport(skipped=[imdb_id for imdb_id in imdb_ids if imdb_id in existing])
+    missing = [imdb_id for imdb_id in imdb_ids if imdb_id not in existing]
+
+    def finish(imdb_id, error):
+        if error is None:
+            report.imported.append(imdb_id)
+        else:
+            logger.warning(f'Prefetch of {imdb_id} failed: {error!r}')
+            report.failed.append([imdb_id, str(error) or type(error).__name__])
+        if on_progress is not None:
+            on_progress(len(report.imported) + len(report.failed), len(missing))
+
+    if concurrency == 1:
+        for imdb_id in missing:
+            try:
+                import_media(imdb_id)
+            except Exception as e:
+                finish(imdb_id, e)
+            else:
+                finish(imdb_id, None)
+        return report
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(import_media_in_thread, imdb_id): imdb_id for imdb_id in missing}
+        for future in as_completed(futures):
+            finish(futures[future], future.exception())
+    return report
@@ -0,0 +1,150 @@
+import asyncio
+import contextvars
+import datetime
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework.exceptions import APIException
+
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+BUCKET_KEY = '{prefix}:rate_limiter:bucket'
+QUOTA_KEY = '{prefix}:rate_limiter:quota:{day}'
+
+# KEYS: bucket, quota of the day
+# ARGV: rate, capacity, tokens to keep in bucket, daily limit
+# returns {1} if token was taken, {0, wait} if bucket is empty, {-1} if daily quota is spent
+TAKE_TOKEN_SCRIPT = '''
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local daily_limit = tonumber(ARGV[4])
+
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+if used >= daily_limit then
+    return {-1}
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+if tokens < reserve + 1 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    return {0, tostring((reserve + 1 - tokens) / rate)}
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+if redis.call('INCR', KEYS[2]) == 1 then
+    redis.call('EXPIRE', KEYS[2], 60 * 60 * 48)
+end
+return {1}
+'''
+
+_priority = contextvars.ContextVar('omdb_priority', default=INTERACTIVE)
+_script = None
+
+
+class OmdbBudgetExceeded(APIException):
+    status_code = 503
+    default_detail = 'OMDb is temporarily unavailable, please try again later.'
+    default_code = 'omdb_budget_exceeded'
+
+
+@contextmanager
+def background_priority():
+    """
+        OMDb requests made within the block yield to interactive
+        ones: they keep part of the bucket and of the daily quota
+    """
+
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_bucket_key():
+    return BUCKET_KEY.format(prefix=settings.OMDB_KEY_PREFIX)
+
+
+def get_quota_key():
+    return QUOTA_KEY.format(prefix=settings.OMDB_KEY_PREFIX, day=datetime.datetime.utcnow().date().isoformat())
+
+
+def take_token():
+    """
+        Takes one token shared by all processes,
+        returns seconds to wait if the bucket is empty
+    """
+
+    global _script
+    if _script is None:
+        _script = get_redis_connection('default').register_script(TAKE_TOKEN_SCRIPT)
+
+    if _priority.get() == BACKGROUND:
+        reserve, daily_limit = settings.OMDB_BACKGROUND_RESERVE, settings.OMDB_BACKGROUND_DAILY_QUOTA
+    else:
+        reserve, daily_limit = 0, settings.OMDB_DAILY_QUOTA
+
+    result = _script(
+        keys=[get_bucket_key(), get_quota_key()],
+        args=[settings.OMDB_RATE, settings.OMDB_BURST, reserve, daily_limit],
+    )
+    if int(result[0]) == -1:
+        logger.warning(f'Daily OMDb quota for {_priority.get()} requests is spent')
+        raise OmdbBudgetExceeded
+    if int(result[0]) == 0:
+        return float(result[1])
+    return 0
+
+
+def acquire():
+    deadline = time.monotonic() + settings.OMDB_RATE_LIMIT_WAIT
+    while wait := take_token():
+        if time.monotonic() + wait > deadline:
+            raise OmdbBudgetExceeded
+        time.sleep(wait)
+
+
+async def aacquire():
+    deadline = time.monotonic() + settings.OMDB_RATE_LIMIT_WAIT
+    while wait := take_token():
+        if time.monotonic() + wait > deadline:
+            raise OmdbBudgetExceeded
+        await asyncio.sleep(wait)
+
+
+def get_budget() -> dict:
+    """
+        Remaining OMDb budget: tokens in bucket and daily quota
+    """
+
+    connection = get_redis_connection('default')
+    tokens, updated = connection.hmget(get_bucket_key(), 'tokens', 'updated')
+    if tokens is None:
+        tokens = settings.OMDB_BURST
+    else:
+        tokens = min(settings.OMDB_BURST, float(tokens) + max(0, time.time() - float(updated)) * settings.OMDB_RATE)
+    used = int(connection.get(get_quota_key()) or 0)
+    return {
+        'tokens': round(tokens, 2),
+        'burst': settings.OMDB_BURST,
+        'rate': settings.OMDB_RATE,
+        'daily_quota': settings.OMDB_DAILY_QUOTA,
+        'used_today': used,
+        'remaining_today': max(0, settings.OMDB_DAILY_QUOTA - used),
+        'remaining_background_today': max(0, settings.OMDB_BACKGROUND_DAILY_QUOTA - used),
+    }
@@ -0,0 +1,17 @@
+from watchlists.models import Season, SeriesDetail
+from watchlists.serializers import SeasonSerializer
+
+
+def build_series_detail(series) -> SeriesDetail:
+    """
+        Serializes all seasons and episodes of the series
+        into its detail document and saves it
+    """
+
+    seasons = Season.objects.filter(series=series).prefetch_related('episodes')
+    data = SeasonSerializer(seasons, many=True).data
+    # pk is the series, so save updates existing document or inserts new one
+    detail = SeriesDetail(series=series, seasons=data)
+    detail.save()
+    series.detail = detail
+    return detail
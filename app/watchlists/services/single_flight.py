@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import LockError
+from rest_framework.exceptions import APIException
+
+
+class ImportInProgress(APIException):
+    status_code = 503
+    default_detail = 'Import of this media is still in progress, please try again later.'
+    default_code = 'import_in_progress'
+
+
+def single_flight(key: str, lookup, create):
+    """
+        Runs create only once across all processes for the given key,
+        concurrent callers wait until the lock holder finishes
+        and get its result through lookup, create gets keep_alive
+        which renews the lock for another IMPORT_LOCK_TIMEOUT
+    """
+    result = lookup()
+    if result is not None:
+        return result
+
+    lock = cache.lock(
+        f'single_flight:{key}',
+        timeout=settings.IMPORT_LOCK_TIMEOUT,
+        blocking_timeout=settings.IMPORT_LOCK_WAIT,
+    )
+    try:
+        with lock:
+            result = lookup()
+            if result is None:
+                result = create(lambda: lock.extend(settings.IMPORT_LOCK_TIMEOUT, replace_ttl=True))
+    except LockError:
+        result = lookup()
+        if result is None:
+            raise ImportInProgress
+    return result
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from base.cache import invalidate, get_media_tag
+from watchlists.models import SeriesDetail
+
+
+@receiver(post_save, sender=SeriesDetail)
+def clear_series_cache(sender, instance, **kwargs):
+    # refreshed seasons must not wait for the cached page to expire
+    invalidate(get_media_tag(instance.series.imdb_id))
@@ -1,49 +1,59 @@
-import asyncio
-import os
-
-import aiohttp
 from celery import shared_task
+from django.core.cache import cache
+
+from watchlists.services import db_refreshing, db_saving, prefetching
+from watchlists.services.rate_limiter import background_priority
 
 
-def get_seasons(session, series_data):
-    tasks = []
-    for season_number in range(1, int(series_data[1]) + 1):
-        url = f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={series_data[0]}&Season={season_number}'
-        tasks.append(session.get(url))
-    return tasks
+def get_import_job_id(imdb_id):
+    return f'import-series-{imdb_id}'
 
 
-def get_episodes(session, episodes):
-    tasks = []
-    for episode in episodes:
-        episode_imdb_id = episode['imdbID']
-        url = f'https://www.omdbapi.com?apikey={os.environ.get("API_KEY")}&i={episode_imdb_id}'
-        tasks.append(session.get(url))
-    return tasks
+def get_import_marker_key(job_id):
+    # set while the import job is queued or running
+    return f'import_job:{job_id}'
 
 
-async def download_seasons(series_data):
-    async with aiohttp.ClientSession() as session:
-        seasons_tasks = get_seasons(session, series_data)
-        response = await asyncio.gather(*seasons_tasks)
-        seasons = [await season.json() for season in response]
-        return seasons
+@shared_task(bind=True)
+def import_series(self, imdb_id):
+    """
+        Imports series in background, downloaded seasons
+        and episodes are reported as PROGRESS state
+    """
 
+    def on_progress(seasons, episodes):
+        self.update_state(state='PROGRESS', meta={'seasons': seasons, 'episodes': episodes})
 
-async def download_episodes(episodes):
-    async with aiohttp.ClientSession() as session:
-        episodes_tasks = get_episodes(session, episodes)
-        response = await asyncio.gather(*episodes_tasks)
-        episodes = []
-        episodes = [await episode.json() for episode in response]
-        return episodes
+    try:
+        series = db_saving.get_or_save_series(imdb_id, on_progress)
+    finally:
+        # finished or failed job may be enqueued again
+        cache.delete(get_import_marker_key(self.request.id))
+    return {'id': str(series.id)}
 
 
 @shared_task
-def get_season_data(series_data):
-    return asyncio.run(download_seasons(series_data))
+def refresh_stale_media():
+    with background_priority():
+        return db_refreshing.refresh_stale_media()
 
 
 @shared_task
-def get_episode_data(episodes):
-    return asyncio.run(download_episodes(episodes))
+def retry_failed_downloads(series_id, failed_seasons, failed_episodes, attempt):
+    with background_priority():
+        db_saving.save_failed_downloads(series_id, failed_seasons, failed_episodes, attempt)
+
+
+@shared_task(bind=True)
+def prefetch_media(self, imdb_ids):
+    """
+        Imports media ahead of user requests,
+        progress is reported as PROGRESS state
+    """
+
+    def on_progress(done, total):
+        self.update_state(state='PROGRESS', meta={'done': done, 'total': total})
+
+    report = prefetching.prefetch_media(imdb_ids, on_progress=on_progress)
+    # failures are logged one by one, result stays small whatever the batch size
+    return {'imported': len(report.imported), 'skipped': len(report.skipped), 'failed': len(report.failed)}
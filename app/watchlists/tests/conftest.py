@@ -1,9 +1,13 @@
 import random
 
 import pytest
+from django.core.cache import cache
 from model_bakery import baker
 from rest_framework.test import APIClient
 
+from watchlists.fake_omdb import FakeOmdbServer
+from watchlists.services import series_detail
+
 
 @pytest.fixture
 def api_client():
@@ -15,12 +19,23 @@ def series_tt1234567():
     """Create series with tt1234567 id in db."""
     series = baker.make("watchlists.Series")
     for season_numb in range(3):
-        episodes_list = [baker.make("watchlists.Episode", imdb_rating=random.uniform(1, 10)) for _ in range(10)]
-        season = baker.make("watchlists.Season")
-        season.episodes.add(*episodes_list)
-        season.season_numb = season_numb
-        season.save()
-        series.seasons.add(season)
+        season = baker.make("watchlists.Season", series=series, season_numb=season_numb)
+        for _ in range(10):
+            baker.make("watchlists.Episode", season=season, imdb_rating=random.uniform(1, 10))
     series.imdb_id = "tt1234567"
     series.save()
+    series_detail.build_series_detail(series)
     return series
+
+
+@pytest.fixture
+def fake_omdb(settings):
+    """Run local OMDb stand-in and point the client to it."""
+    server = FakeOmdbServer().start()
+    settings.OMDB_BASE_URL = server.url
+    settings.OMDB_KEY_PREFIX = "fake_omdb"
+    settings.OMDB_RATE = settings.OMDB_BURST = 1000
+    settings.OMDB_RETRY_BACKOFF = 0
+    cache.delete_pattern("fake_omdb:*")
+    yield server
+    server.stop()
@@ -0,0 +1,37 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django_redis import get_redis_connection
+
+from watchlists.models import Media
+from watchlists.services import rate_limiter
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmark_ingestion_reports_every_case_and_rolls_back():
+    # given
+    out = StringIO()
+    # when
+    call_command("benchmark_ingestion", seasons=[1, 2], episodes=3, stdout=out)
+    # then
+    lines = out.getvalue().splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["save_movie", "save_series", "save_series"], "Every case must be reported"
+    assert lines[3].split()[4] == str(1 + 2 + 6), "Series, its seasons and episodes must be requested"
+    assert not Media.objects.exists(), "Saved media must be rolled back"
+
+
+def test_benchmark_ingestion_leaves_omdb_quota_and_cache_alone():
+    # given
+    quota_key = rate_limiter.get_quota_key()
+    get_redis_connection("default").delete(quota_key)
+    cache.delete_pattern("omdb:*")
+    cache.set("omdb:id:cached", {"Response": "True"})
+    # when
+    call_command("benchmark_ingestion", seasons=[2], episodes=3, stdout=StringIO())
+    # then
+    assert not get_redis_connection("default").exists(quota_key), "Requests to the stand-in must not spend daily quota of OMDb"
+    assert cache.get("omdb:id:cached") is not None, "Cached OMDb responses must not be dropped"
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from model_bakery import baker
+
+from watchlists.fake_omdb import FakeOmdbServer, get_fixture_name, get_series_id
+from watchlists.models import Episode, Movie
+from watchlists.services import db_saving, ingestion
+
+
+pytestmark = pytest.mark.django_db
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "omdb"
+
+
+@pytest.fixture
+def point_omdb_to(settings):
+    def point(server):
+        settings.OMDB_BASE_URL = server.url
+        settings.OMDB_KEY_PREFIX = "fake_omdb"
+        settings.OMDB_RATE = settings.OMDB_BURST = 1000
+        settings.OMDB_RETRY_BACKOFF = 0
+        cache.delete_pattern("fake_omdb:*")
+    return point
+
+
+def test_save_series_from_fake_omdb(fake_omdb):
+    # given
+    imdb_id = get_series_id(total_seasons=5, episodes_per_season=12)
+    # when
+    series = db_saving.save_series(imdb_id)
+    # then
+    assert series.seasons.count() == 5, "All seasons must be attached to the series"
+    assert Episode.objects.filter(season__series=series).count() == 60, "All episodes must be attached to the seasons"
+    assert fake_omdb.stats["requests"] == 1 + 5 + 60, "Series, every season and every episode must be requested once"
+
+
+def test_save_movie_from_fake_omdb(fake_omdb):
+    # when
+    movie = db_saving.save_movie("tt6000042")
+    # then
+    assert movie.title == "Movie 42", "Movie must be saved from the fake response"
+    assert fake_omdb.stats["requests"] == 1, "Movie must be requested once"
+
+
+def test_downloaded_episodes_keep_only_needed_fields(fake_omdb):
+    # given
+    episodes = [{"imdbID": "tt7001002001001"}, {"imdbID": "tt7001002001002"}]
+    # when
+    result = ingestion.fetch_episodes(episodes)
+    # then
+    assert not result.failed, "All episodes must be downloaded"
+    assert all(set(record) == set(ingestion.EPISODE_FIELDS) for record in result.records), "Episodes must be projected to needed fields"
+
+
+def test_save_movie_returns_already_saved_movie(fake_omdb):
+    # given
+    saved = baker.make("watchlists.Movie", imdb_id="tt6000042")
+    # when
+    movie = db_saving.save_movie("tt6000042")
+    # then
+    assert movie.id == saved.id, "Already saved movie must be returned"
+    assert Movie.objects.filter(imdb_id="tt6000042").count() == 1, "Movie must not be duplicated"
+
+
+def test_save_movie_from_recorded_fixture(point_omdb_to):
+    # given
+    server = FakeOmdbServer(fixtures=FIXTURES).start()
+    point_omdb_to(server)
+    # when
+    try:
+        movie = db_saving.save_movie("tt0111161")
+    finally:
+        server.stop()
+    # then
+    assert movie.title == "The Shawshank Redemption", "Movie must be saved from the recorded response"
+    assert server.stats["replayed"] == 1, "Recorded response must be replayed"
+
+
+def test_missing_fixture_is_recorded_from_upstream(point_omdb_to, tmp_path):
+    # given
+    upstream = FakeOmdbServer().start()
+    server = FakeOmdbServer(fixtures=tmp_path, upstream=upstream.url).start()
+    point_omdb_to(server)
+    # when
+    try:
+        db_saving.save_movie("tt6000007")
+        cache.delete_pattern("fake_omdb:*")
+        db_saving.save_movie("tt6000007")
+    finally:
+        server.stop()
+        upstream.stop()
+    # then
+    assert (tmp_path / get_fixture_name({"i": "tt6000007"})).exists(), "Missing response must be recorded"
+    assert (server.stats["recorded"], server.stats["replayed"]) == (1, 1), "Recorded response must be replayed next time"
+    assert upstream.stats["requests"] == 1, "Upstream must be requested only once"
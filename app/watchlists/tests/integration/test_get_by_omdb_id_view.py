@@ -1,11 +1,25 @@
+import base64
+import datetime
+import json
 import os
+import threading
+import time
 
 import pytest
 import requests
+from model_bakery import baker
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
+from rest_framework.request import Request
 
 
-from watchlists.models import Series, Movie, Media
+from reviews.models import Review
+from watchlists.models import Series, Movie, Media, Episode, SeriesDetail
+from watchlists.serializers import SeriesSerializer
+from watchlists.services import series_detail
+from watchlists.services.single_flight import single_flight
+from watchlists.tasks import import_series
 
 
 pytestmark = pytest.mark.django_db
@@ -57,6 +71,51 @@ def test_get_with_incorrect_imdb_id_and_type_query_params(api_client):
     assert response.status_code == 404, "Status code of response must be 404"
 
 
+def test_get_existing_series_is_not_imported_again(api_client, series_tt1234567, mocker):
+    # given
+    imdb_id = "tt1234567"
+    type = "series"
+    save_series = mocker.patch("watchlists.services.db_saving.save_series")
+    # when
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": imdb_id, "type": type})
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    assert not save_series.called, "Series which is already in db must not be imported"
+
+
+def test_get_not_imported_series_in_background(api_client, settings, mocker):
+    # given
+    settings.SERIES_IMPORT_IN_BACKGROUND = 1
+    imdb_id = "tt7654321"
+    type = "series"
+    cache.delete(f"import_job:import-series-{imdb_id}")
+    apply_async = mocker.patch("watchlists.views.import_series.apply_async")
+    # when
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": imdb_id, "type": type})
+    polled = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": imdb_id, "type": type})
+    # then
+    assert polled.status_code == 202, "Status code of response must be 202 while the import is running"
+    assert response.status_code == 202, "Status code of response must be 202"
+    assert response.json().get("job_id") == f"import-series-{imdb_id}", "The response must contain id of the import job"
+    apply_async.assert_called_once_with((imdb_id,), task_id=f"import-series-{imdb_id}")
+
+
+def test_get_series_in_background_after_failed_import(api_client, settings, mocker):
+    # given
+    settings.SERIES_IMPORT_IN_BACKGROUND = 1
+    imdb_id = "tt7654322"
+    job_id = f"import-series-{imdb_id}"
+    cache.delete(f"import_job:{job_id}")
+    import_series.backend.mark_as_failure(job_id, ConnectionError())
+    mocker.patch("watchlists.views.import_series.apply_async")
+    # when
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": imdb_id, "type": "series"})
+    status = api_client.get(response.json()["status"])
+    # then
+    assert status.status_code == 202, "Status code of response must be 202 while the new import is queued"
+    assert status.json().get("status") == "PENDING", "Failure of the previous import must not be reported"
+
+
 def test_post(api_client):
     # when
     response = api_client.post(reverse("watchlists_app:get_by_omdbid"))
@@ -83,3 +142,189 @@ def test_delete(api_client):
     response = api_client.delete(reverse("watchlists_app:get_by_omdbid"))
     # then
     assert response.status_code == 405, "Status code of response must be 405"
+
+
+def test_get_series_is_served_from_detail_document_filtered_by_rating(api_client, series_tt1234567):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    imdb_id = "tt1234567"
+    type = "series"
+    imdb_rating = "5.5"
+    # when
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": imdb_id, "type": type, "imdb_rating": imdb_rating})
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    assert SeriesDetail.objects.filter(series=series_tt1234567).exists(), "Detail document must be built for series imported before"
+    seasons = response.json()["seasons"]
+    assert len(seasons) == 3, "All seasons must be returned"
+    expected = Episode.objects.filter(season__series=series_tt1234567, imdb_rating__gte=5.5).count()
+    assert sum(len(season["episodes"]) for season in seasons) == expected, "Only episodes rated at least imdb_rating must be returned"
+
+
+@pytest.mark.parametrize("total_seasons", [1, 30])
+def test_get_series_issues_constant_number_of_queries(api_client, total_seasons, django_assert_num_queries):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    series = baker.make("watchlists.Series", imdb_id=f"tt70000{total_seasons:02}")
+    for season_numb in range(1, total_seasons + 1):
+        season = baker.make("watchlists.Season", series=series, season_numb=season_numb)
+        baker.make("watchlists.Episode", season=season, imdb_rating=7.0, _quantity=3)
+    series_detail.build_series_detail(series)
+    # when
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": series.imdb_id, "type": "series", "imdb_rating": "6"})
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    assert len(response.json()["seasons"]) == total_seasons, "All seasons must be returned"
+
+
+def test_get_movie_reviews_issue_constant_number_of_queries(api_client, django_assert_num_queries):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    movie = baker.make("watchlists.Movie", imdb_id="tt7000100")
+    current_user = baker.make(get_user_model())
+    for review in baker.make("reviews.Review", media=movie, likes_count=2, dislikes_count=2, _quantity=5):
+        baker.make("reviews.ReviewLikes", review=review, user=current_user, like=False)
+    api_client.force_authenticate(current_user)
+    # when
+    with django_assert_num_queries(3):
+        response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    for review in response.json()["reviews"]["results"]:
+        assert review["likes"] == 2, "Likes of the review must be counted"
+        assert review["dislikes"] == 2, "Dislikes of the review must be counted"
+        assert review["current_user_reviewlike"]["like"] is False, "Reviewlike of the current user must be returned"
+
+
+def test_get_movie_reviews_are_paginated_by_cursor(api_client):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    movie = baker.make("watchlists.Movie", imdb_id="tt7000200")
+    reviews = baker.make("reviews.Review", media=movie, _quantity=7)
+    for days, review in enumerate(reviews):
+        Review.objects.filter(id=review.id).update(created=datetime.date(2023, 1, 1) + datetime.timedelta(days=days % 3))
+    expected = [str(id) for id in Review.objects.filter(media=movie).order_by("-created", "-id").values_list("id", flat=True)]
+    # when
+    pages = [api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie", "size": 3, "count": "true"}).json()["reviews"]]
+    while pages[-1]["next"]:
+        pages.append(api_client.get(pages[-1]["next"]).json()["reviews"])
+    previous_page = api_client.get(pages[1]["previous"]).json()["reviews"]
+    # then
+    assert [review["id"] for page in pages for review in page["results"]] == expected, "Pages must hold all reviews, newest first"
+    assert [len(page["results"]) for page in pages] == [3, 3, 1], "Pages must be of the requested size"
+    assert pages[0]["count"] == 7, "Count must be returned when requested"
+    assert "count" not in pages[1], "Count must not be returned if not requested"
+    assert previous_page["results"] == pages[0]["results"], "Previous link must lead to the previous page"
+    assert pages[0]["previous"] is None, "The first page must have no previous link"
+
+
+def test_get_movie_is_invalidated_on_review_and_reviewlike_changes(api_client, django_capture_on_commit_callbacks, django_assert_num_queries):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    movie = baker.make("watchlists.Movie", imdb_id="tt7000300")
+    other_movie = baker.make("watchlists.Movie", imdb_id="tt7000400")
+    api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": other_movie.imdb_id, "type": "movie"})
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        review = baker.make("reviews.Review", media=movie)
+    with_review = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    with django_capture_on_commit_callbacks(execute=True):
+        Review.objects.filter(id=review.id).update(likes_count=1)
+        baker.make("reviews.ReviewLikes", review=review, like=True)
+    with_like = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    with django_assert_num_queries(0):
+        other_response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": other_movie.imdb_id, "type": "movie"})
+    # then
+    assert len(with_review.json()["reviews"]["results"]) == 1, "New review must not wait for the cached page to expire"
+    assert with_like.json()["reviews"]["results"][0]["likes"] == 1, "New like must not wait for the cached page to expire"
+    assert other_response.status_code == 200, "Other media must be served from cache"
+
+
+def test_concurrent_imports_are_coalesced_into_one():
+    # given
+    cache.delete("single_flight:movie:tt7000500")
+    saved = []
+    results = []
+
+    def create(keep_alive):
+        time.sleep(0.2)
+        saved.append("movie")
+        return "movie"
+
+    def get_or_save():
+        results.append(single_flight("movie:tt7000500", lookup=lambda: saved[0] if saved else None, create=create))
+
+    threads = [threading.Thread(target=get_or_save) for _ in range(3)]
+    # when
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # then
+    assert len(saved) == 1, "Media must be imported only once"
+    assert results == ["movie"] * 3, "All callers must get the imported media"
+
+
+def test_import_keeps_lock_alive_longer_than_its_timeout(settings):
+    # given
+    settings.IMPORT_LOCK_TIMEOUT = 1
+    cache.delete("single_flight:movie:tt7000550")
+    held = []
+
+    def create(keep_alive):
+        for _ in range(3):
+            time.sleep(0.6)
+            keep_alive()
+        held.append(cache.lock("single_flight:movie:tt7000550").locked())
+        return "movie"
+
+    # when
+    result = single_flight("movie:tt7000550", lookup=lambda: None, create=create)
+    # then
+    assert held == [True], "Lock must be held until the import finishes"
+    assert result == "movie", "Import must return its result"
+
+
+def test_get_while_import_lock_is_held(api_client, settings, mocker):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    settings.IMPORT_LOCK_WAIT = 0
+    save_movie = mocker.patch("watchlists.services.db_saving.save_movie")
+    lock = cache.lock("single_flight:movie:tt7000600", timeout=10)
+    lock.acquire()
+    # when
+    try:
+        response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": "tt7000600", "type": "movie"})
+    finally:
+        lock.release()
+    # then
+    assert response.status_code == 503, "Status code of response must be 503"
+    assert not save_movie.called, "Media must not be imported while another import holds the lock"
+
+
+def test_series_is_serialized_from_detail_document_without_writes(series_tt1234567, rf, django_assert_num_queries):
+    # given
+    series = Series.objects.select_related("detail").get(id=series_tt1234567.id)
+    SeriesDetail.objects.filter(series=series).update(seasons=[])
+    series.detail.refresh_from_db()
+    context = {"request": Request(rf.get("/")), "imdb_rating": None}
+    # when
+    # only reviews of the series are read
+    with django_assert_num_queries(1):
+        data = SeriesSerializer(series, context=context).data
+    # then
+    assert data["seasons"] == [], "Seasons must be read from the stored detail document as is"
+
+
+@pytest.mark.parametrize("position", [["not a date", "b5e0c9c0-3c5e-4b8e-9d5d-1a2b3c4d5e6f", False], ["2023-01-01T00:00:00", "not a uuid", False], "garbage"])
+def test_get_movie_reviews_with_tampered_cursor(api_client, position):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    movie = baker.make("watchlists.Movie", imdb_id="tt7000700")
+    cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+    # when
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie", "cursor": cursor})
+    # then
+    assert response.status_code == 404, "Status code of response must be 404"
@@ -111,3 +111,15 @@ def test_delete(api_client):
     response = api_client.delete(reverse("watchlists_app:get_season_by_omdbid"))
     # then
     assert response.status_code == 405, "Status code of response must be 405"
+
+
+def test_get_season_with_imdb_rating_issues_constant_number_of_queries(api_client, series_tt1234567, django_assert_num_queries):
+    # given
+    imdb_id = "tt1234567"
+    season = 1
+    imdb_rating = "5.5"
+    # when
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("watchlists_app:get_season_by_omdbid"), {"imdb_id": imdb_id, "season": season, "imdb_rating": imdb_rating})
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
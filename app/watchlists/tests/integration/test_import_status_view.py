@@ -0,0 +1,71 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from watchlists.tasks import get_import_marker_key
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_with_running_import(api_client, mocker):
+    # given
+    job_id = "import-series-tt1234567"
+    mocker.patch("watchlists.views.AsyncResult", return_value=mocker.Mock(state="PROGRESS", info={"seasons": 2, "episodes": 20}))
+    # when
+    response = api_client.get(reverse("watchlists_app:import_status", args=(job_id,)))
+    # then
+    assert response.status_code == 202, "Status code of response must be 202"
+    assert response.json().get("progress") == {"seasons": 2, "episodes": 20}, "The response must contain progress of the import"
+
+
+def test_get_with_finished_import(api_client, series_tt1234567, mocker):
+    # given
+    job_id = "import-series-tt1234567"
+    mocker.patch("watchlists.views.AsyncResult", return_value=mocker.Mock(state="SUCCESS", result={"id": str(series_tt1234567.id)}))
+    # when
+    response = api_client.get(reverse("watchlists_app:import_status", args=(job_id,)))
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    assert response.json()["media"]["id"] == str(series_tt1234567.id), "The response must contain imported series"
+    assert len(response.json()["media"]["seasons"]) == 3, "The response must contain seasons of imported series"
+
+
+def test_get_with_failed_import(api_client, mocker):
+    # given
+    job_id = "import-series-tt1234567"
+    mocker.patch("watchlists.views.AsyncResult", return_value=mocker.Mock(state="FAILURE"))
+    # when
+    response = api_client.get(reverse("watchlists_app:import_status", args=(job_id,)))
+    # then
+    assert response.status_code == 500, "Status code of response must be 500"
+    assert response.json().get("status") == "FAILURE", "The response must contain status of the import"
+
+
+def test_get_with_queued_import(api_client, mocker):
+    # given
+    job_id = "import-series-tt1234567"
+    cache.set(get_import_marker_key(job_id), 1)
+    mocker.patch("watchlists.views.AsyncResult", return_value=mocker.Mock(state="PENDING"))
+    # when
+    response = api_client.get(reverse("watchlists_app:import_status", args=(job_id,)))
+    cache.delete(get_import_marker_key(job_id))
+    # then
+    assert response.status_code == 202, "Status code of response must be 202"
+
+
+def test_get_with_unknown_job_id(api_client):
+    # given
+    job_id = "import-series-unknown"
+    cache.delete(get_import_marker_key(job_id))
+    # when
+    response = api_client.get(reverse("watchlists_app:import_status", args=(job_id,)))
+    # then
+    assert response.status_code == 404, "Status code of response must be 404"
+
+
+def test_post(api_client):
+    # when
+    response = api_client.post(reverse("watchlists_app:import_status", args=("some_job_id",)))
+    # then
+    assert response.status_code == 405, "Status code of response must be 405"
@@ -0,0 +1,51 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin():
+    admin = get_user_model().objects.create(
+        email='test_admin@email.com',
+        username='test_admin_name',
+        password='test_admin_password',
+        is_staff=True,
+        is_superuser=True
+    )
+    return admin
+
+
+def test_get_with_unauthenticated_user(api_client):
+    # when
+    response = api_client.get(reverse("watchlists_app:omdb_budget"))
+    # then
+    assert response.status_code == 401, "Status code of response must be 401"
+
+
+def test_get_with_admin(api_client, admin):
+    # given
+    api_client.force_authenticate(user=admin)
+    # when
+    response = api_client.get(reverse("watchlists_app:omdb_budget"))
+    # then
+    assert response.status_code == 200, "Status code of response must be 200"
+    assert "remaining_today" in response.json(), "The response must contain remaining daily quota"
+
+
+def test_search_with_spent_daily_quota(api_client, settings):
+    # given
+    settings.OMDB_DAILY_QUOTA = 0
+    # when
+    response = api_client.get(reverse("watchlists_app:search"), {"search": "Not cached title with spent quota"})
+    # then
+    assert response.status_code == 503, "Status code of response must be 503"
+
+
+def test_post(api_client):
+    # when
+    response = api_client.post(reverse("watchlists_app:omdb_budget"))
+    # then
+    assert response.status_code == 401, "Status code of response must be 401"
@@ -0,0 +1,97 @@
+import pytest
+from model_bakery import baker
+
+from watchlists.fake_omdb import get_series_id
+from watchlists.models import Movie, Series
+from watchlists.services import ingestion, prefetching
+from watchlists.services.omdb_client import omdb_client
+from watchlists.tasks import prefetch_media
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_prefetch_media_imports_missing_and_skips_saved(fake_omdb):
+    # given
+    baker.make("watchlists.Movie", imdb_id="tt6000001")
+    series_id = get_series_id(total_seasons=2, episodes_per_season=3)
+    progress = []
+    # when
+    report = prefetching.prefetch_media(
+        ["tt6000001", "tt6000002", series_id, "tt0000000", "tt6000002"],
+        concurrency=1,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+    # then
+    assert report.skipped == ["tt6000001"], "Saved media must be skipped"
+    assert report.imported == ["tt6000002", series_id], "Missing media must be imported once"
+    assert [imdb_id for imdb_id, _ in report.failed] == ["tt0000000"], "Unknown id must be reported as failed"
+    assert Movie.objects.filter(imdb_id="tt6000002").exists(), "Movie must be detected by OMDb type"
+    assert Series.objects.get(imdb_id=series_id).seasons.count() == 2, "Series must be saved with its seasons"
+    assert progress == [(1, 3), (2, 3), (3, 3)], "Progress must be reported after every media"
+
+
+def test_prefetch_media_concurrently_closes_thread_clients(fake_omdb, mocker):
+    # given
+    imdb_ids = [f"tt60000{number}" for number in range(10, 16)]
+    loops = []
+
+    def save(imdb_id):
+        # downloads through the async client of the worker thread, db saving is not under test
+        ingestion.fetch_episodes([{"imdbID": "tt7001002001001"}])
+        loops.append(omdb_client.loop)
+
+    mocker.patch("watchlists.services.prefetching.db_saving.get_or_save_movie", side_effect=save)
+    # when
+    report = prefetching.prefetch_media(imdb_ids, concurrency=3)
+    # then
+    assert not report.failed, "All media must be imported"
+    assert sorted(report.imported) == imdb_ids, "Every media must be imported once"
+    assert len(loops) == len(imdb_ids), "Every media must be downloaded by a worker thread"
+    assert all(loop.is_closed() for loop in loops), "Worker must close its event loop and async session after every media"
+
+
+def test_prefetch_media_task_returns_counters(fake_omdb, settings):
+    # given
+    settings.PREFETCH_CONCURRENCY = 1
+    baker.make("watchlists.Movie", imdb_id="tt6000001")
+    # when
+    result = prefetch_media.apply(args=[["tt6000001", "tt6000003"]], task_id="prefetch-counters")
+    # then
+    assert result.get() == {"imported": 1, "skipped": 1, "failed": 0}, "Task must return counters only"
+
+
+def test_prefetch_media_task_result_does_not_grow_with_failures(fake_omdb, settings):
+    # given
+    settings.PREFETCH_CONCURRENCY = 1
+    settings.CELERY_RESULT_MAX_SIZE = 64
+    imdb_ids = [f"tt0{number:06}" for number in range(50)]
+    # when
+    result = prefetch_media.apply(args=[imdb_ids], task_id="prefetch-failures")
+    # then
+    assert result.get() == {"imported": 0, "skipped": 0, "failed": 50}, "Failures must be counted"
+
+
+def test_task_called_directly_pushes_its_request(mocker):
+    # given
+    requests = []
+
+    def prefetch(imdb_ids, on_progress):
+        requests.append(prefetch_media.request.args)
+        return prefetching.PrefetchReport(imported=imdb_ids)
+
+    mocker.patch("watchlists.tasks.prefetching.prefetch_media", side_effect=prefetch)
+    # when
+    result = prefetch_media(["tt6000001"])
+    # then
+    assert result == {"imported": 1, "skipped": 0, "failed": 0}, "Task must return counters"
+    assert requests == [(["tt6000001"],)], "Direct call must go through Task.__call__"
+
+
+def test_task_result_over_size_limit_fails(settings):
+    # given
+    settings.CELERY_RESULT_MAX_SIZE = 10
+    baker.make("watchlists.Movie", imdb_id="tt6000001")
+    # when / then
+    with pytest.raises(ValueError):
+        prefetch_media(["tt6000001"])
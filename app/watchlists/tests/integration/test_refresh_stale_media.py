@@ -0,0 +1,151 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from model_bakery import baker
+
+from watchlists.models import Media, SeriesDetail
+from watchlists.services import db_refreshing, rate_limiter
+from watchlists.services.ingestion import FetchResult
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_stale(media, days=30):
+    Media.objects.filter(id=media.id).update(last_retrieved=datetime.date.today() - datetime.timedelta(days=days))
+
+
+def test_refresh_updates_stale_movie(mocker):
+    # given
+    movie = baker.make("watchlists.Movie", imdb_id="tt2222222", imdb_rating=5.0, runtime=90)
+    make_stale(movie)
+    mocker.patch(
+        "watchlists.services.db_refreshing.req.get_omdb_by_omdbid",
+        return_value={"imdbRating": "7.3", "Poster": movie.poster, "Plot": "New plot", "Runtime": "95 min"}
+    )
+    # when
+    refreshed = db_refreshing.refresh_stale_media()
+    # then
+    movie.refresh_from_db()
+    assert refreshed == 1, "One stale media must be refreshed"
+    assert movie.imdb_rating == 7.3, "Rating of the movie must be updated"
+    assert movie.runtime == 95, "Runtime of the movie must be updated"
+    assert movie.last_retrieved == datetime.date.today(), "The movie must be marked as retrieved today"
+
+
+def test_refresh_pushes_back_failing_media(settings, mocker):
+    # given
+    settings.MEDIA_REFRESH_BATCH_SIZE = 1
+    failing = baker.make("watchlists.Movie", imdb_id="tt2222223", imdb_rating=5.0)
+    movie = baker.make("watchlists.Movie", imdb_id="tt2222224", imdb_rating=5.0, runtime=90)
+    make_stale(failing, days=60)
+    make_stale(movie)
+
+    def get_omdb_by_omdbid(imdb_id):
+        if imdb_id == failing.imdb_id:
+            raise ConnectionError
+        return {"imdbRating": "7.3", "Poster": movie.poster, "Plot": "New plot", "Runtime": "95 min"}
+
+    mocker.patch("watchlists.services.db_refreshing.req.get_omdb_by_omdbid", side_effect=get_omdb_by_omdbid)
+    # when
+    first = db_refreshing.refresh_stale_media()
+    second = db_refreshing.refresh_stale_media()
+    # then
+    failing.refresh_from_db()
+    movie.refresh_from_db()
+    assert (first, second) == (0, 1), "Failed media must not be retried before the rest of stale media"
+    assert failing.imdb_rating == 5.0, "Failed media must keep its data"
+    assert failing.last_retrieved == datetime.date.today(), "Failed media must be pushed back"
+    assert movie.imdb_rating == 7.3, "Media after the failed one must be refreshed"
+
+
+def test_refresh_stops_when_omdb_budget_is_exceeded(mocker):
+    # given
+    movie = baker.make("watchlists.Movie", imdb_id="tt2222225", imdb_rating=5.0, runtime=90)
+    untouched = baker.make("watchlists.Movie", imdb_id="tt2222226", imdb_rating=5.0)
+    make_stale(movie, days=60)
+    make_stale(untouched)
+
+    def get_omdb_by_omdbid(imdb_id):
+        if imdb_id == untouched.imdb_id:
+            raise rate_limiter.OmdbBudgetExceeded
+        return {"imdbRating": "7.3", "Poster": movie.poster, "Plot": "New plot", "Runtime": "95 min"}
+
+    mocker.patch("watchlists.services.db_refreshing.req.get_omdb_by_omdbid", side_effect=get_omdb_by_omdbid)
+    # when
+    refreshed = db_refreshing.refresh_stale_media()
+    # then
+    untouched.refresh_from_db()
+    assert refreshed == 1, "Media before the budget was exceeded must be refreshed"
+    assert untouched.last_retrieved < datetime.date.today(), "Media left after the budget was exceeded must not be pushed back"
+
+
+def test_refresh_skips_fresh_media(mocker):
+    # given
+    baker.make("watchlists.Movie", imdb_id="tt3333333")
+    get_omdb_by_omdbid = mocker.patch("watchlists.services.db_refreshing.req.get_omdb_by_omdbid")
+    # when
+    refreshed = db_refreshing.refresh_stale_media()
+    # then
+    assert refreshed == 0, "Fresh media must not be refreshed"
+    assert not get_omdb_by_omdbid.called, "Fresh media must not be requested from OMDb"
+
+
+def test_refresh_skips_interrupted_series_import(mocker):
+    # given
+    series = baker.make("watchlists.Series", imdb_id="tt3333334")
+    make_stale(series)
+    get_omdb_by_omdbid = mocker.patch("watchlists.services.db_refreshing.req.get_omdb_by_omdbid")
+    # when
+    refreshed = db_refreshing.refresh_stale_media()
+    # then
+    assert refreshed == 0, "Series without detail document must not be refreshed"
+    assert not get_omdb_by_omdbid.called, "Series without detail document must not be requested from OMDb"
+    assert not SeriesDetail.objects.filter(series=series).exists(), "Detail document must not be built by a refresh"
+
+
+def test_refresh_adds_new_episodes_of_ongoing_series(series_tt1234567, mocker):
+    # given
+    last_season = series_tt1234567.seasons.order_by("season_numb").last()
+    episodes_count = last_season.episodes.count()
+    total_episodes = last_season.total_episodes
+    make_stale(series_tt1234567)
+    mocker.patch(
+        "watchlists.services.db_refreshing.req.get_omdb_by_omdbid",
+        return_value={"imdbRating": "8.0", "Poster": series_tt1234567.poster, "Plot": "Plot", "Year": "2019–", "totalSeasons": str(last_season.season_numb)}
+    )
+    new_episode = {
+        "Title": "New episode", "Released": "01 Jan 2023", "Episode": "100", "Plot": "Plot",
+        "Poster": "https://example.com/poster.jpg", "imdbRating": "9.0", "Runtime": "45 min",
+    }
+    season_data = {"Season": str(last_season.season_numb), "Episodes": [{"Episode": "100", "imdbRating": "9.0", "imdbID": "tt0000100"}]}
+    iter_seasons = mocker.patch("watchlists.services.db_refreshing.ingestion.iter_seasons", return_value=[(last_season.season_numb, season_data, FetchResult(records=[new_episode]))])
+    # when
+    db_refreshing.refresh_stale_media()
+    # then
+    last_season.refresh_from_db()
+    assert list(iter_seasons.call_args.args[1]) == [last_season.season_numb], "Only the last known season must be downloaded"
+    assert last_season.episodes.count() == episodes_count + 1, "New episode must be added to the last season"
+    assert last_season.total_episodes == total_episodes + 1, "The number of episodes must be updated"
+    episode_numbers = [episode["episode_numb"] for season in SeriesDetail.objects.get(series=series_tt1234567).seasons for episode in season["episodes"]]
+    assert 100 in episode_numbers, "Detail document must be rebuilt with the new episode"
+
+
+def test_refresh_invalidates_cached_media_page(api_client, mocker, django_capture_on_commit_callbacks):
+    # given
+    cache.delete_pattern("*get_media_view*")
+    movie = baker.make("watchlists.Movie", imdb_id="tt2222225", imdb_rating=5.0, runtime=90)
+    api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    make_stale(movie)
+    mocker.patch(
+        "watchlists.services.db_refreshing.req.get_omdb_by_omdbid",
+        return_value={"imdbRating": "7.3", "Poster": movie.poster, "Plot": "New plot", "Runtime": "95 min"}
+    )
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        db_refreshing.refresh_stale_media()
+    response = api_client.get(reverse("watchlists_app:get_by_omdbid"), {"imdb_id": movie.imdb_id, "type": "movie"})
+    # then
+    assert response.json()["imdb_rating"] == 7.3, "Refreshed media must not be served from cache"
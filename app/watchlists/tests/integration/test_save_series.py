@@ -0,0 +1,141 @@
+import pytest
+from model_bakery import baker
+
+from watchlists.models import Series, Season, Episode, SeriesDetail
+from watchlists.services import db_saving
+from watchlists.tasks import retry_failed_downloads
+from watchlists.services.ingestion import FetchResult
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_series_data(imdb_id, total_seasons):
+    return {
+        "Response": "True", "Title": "Some series", "Year": "2010-2015", "Released": "01 Jan 2010",
+        "Genre": "Drama", "Plot": "Some plot", "totalSeasons": str(total_seasons),
+        "Poster": "https://example.com/poster.jpg", "imdbID": imdb_id, "imdbRating": "8.5",
+    }
+
+
+def make_season_download(season_numb, total_episodes, failed_episodes=()):
+    season_data = {"Response": "True", "Season": str(season_numb), "Episodes": []}
+    episodes_data = [
+        {
+            "Response": "True", "Title": f"Episode {episode_numb}", "Released": "02 Jan 2010",
+            "Episode": str(episode_numb), "Plot": "Some plot", "Poster": "https://example.com/poster.jpg",
+            "imdbRating": "7.5", "Runtime": "45 min",
+        }
+        for episode_numb in range(1, total_episodes + 1)
+    ]
+    return season_numb, season_data, FetchResult(records=episodes_data, failed=list(failed_episodes))
+
+
+@pytest.mark.parametrize("total_seasons", [1, 20])
+def test_save_series_issues_constant_number_of_queries(total_seasons, mocker, django_assert_max_num_queries):
+    # given
+    imdb_id = "tt1111111"
+    mocker.patch("watchlists.services.db_saving.req.get_omdb_by_omdbid", return_value=make_series_data(imdb_id, total_seasons))
+    mocker.patch(
+        "watchlists.services.db_saving.ingestion.iter_seasons",
+        return_value=[make_season_download(season_numb, 10) for season_numb in range(1, total_seasons + 1)]
+    )
+    # when
+    # 6 of them are savepoints, batches and the final step are atomic on their own,
+    # one looks for a series left by an interrupted import
+    with django_assert_max_num_queries(17):
+        series = db_saving.save_series(imdb_id)
+    # then
+    assert series.seasons.count() == total_seasons, "All seasons must be attached to the series"
+    assert Episode.objects.filter(season__series=series).count() == total_seasons * 10, "All episodes must be attached to the seasons"
+    assert not Season.objects.exclude(total_episodes=10).exists(), "Every season must count its episodes"
+
+
+def test_save_series_keeps_downloaded_part_and_schedules_retry(mocker, django_capture_on_commit_callbacks):
+    # given
+    imdb_id = "tt4444444"
+    failed_episode = {"imdbID": "tt4444445", "Episode": "10"}
+    mocker.patch("watchlists.services.db_saving.req.get_omdb_by_omdbid", return_value=make_series_data(imdb_id, 3))
+    mocker.patch(
+        "watchlists.services.db_saving.ingestion.iter_seasons",
+        return_value=[make_season_download(1, 10), (2, None, None), make_season_download(3, 9, [failed_episode])]
+    )
+    retry = mocker.patch("watchlists.tasks.retry_failed_downloads.apply_async")
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        series = db_saving.save_series(imdb_id)
+    # then
+    assert series.seasons.count() == 2, "Downloaded seasons must be saved"
+    assert Episode.objects.filter(season__series=series).count() == 19, "Downloaded episodes must be saved"
+    retry.assert_called_once()
+    assert retry.call_args.args[0] == (str(series.id), [2], [[3, [failed_episode]]], 1), "Only failed downloads must be retried"
+
+
+def test_save_series_is_removed_if_download_fails(mocker, settings):
+    # given
+    settings.INGESTION_BATCH_SIZE = 1
+    imdb_id = "tt5555555"
+    mocker.patch("watchlists.services.db_saving.req.get_omdb_by_omdbid", return_value=make_series_data(imdb_id, 2))
+
+    def downloads(*args, **kwargs):
+        yield make_season_download(1, 10)
+        raise ConnectionError
+
+    mocker.patch("watchlists.services.db_saving.ingestion.iter_seasons", side_effect=downloads)
+    # when
+    with pytest.raises(ConnectionError):
+        db_saving.save_series(imdb_id)
+    # then
+    assert not Season.objects.filter(series__imdb_id=imdb_id).exists(), "Saved batches of failed import must be removed"
+    assert not Series.objects.filter(imdb_id=imdb_id).exists(), "Failed import must not leave the series behind"
+
+
+def test_get_or_save_series_imports_interrupted_series_again(mocker):
+    # given
+    imdb_id = "tt5555556"
+    # batches of a killed import are committed, its detail document is never built
+    interrupted = baker.make("watchlists.Series", imdb_id=imdb_id)
+    baker.make("watchlists.Season", series=interrupted, season_numb=1)
+    mocker.patch("watchlists.services.db_saving.req.get_omdb_by_omdbid", return_value=make_series_data(imdb_id, 2))
+    mocker.patch(
+        "watchlists.services.db_saving.ingestion.iter_seasons",
+        return_value=[make_season_download(1, 10), make_season_download(2, 10)]
+    )
+    # when
+    series = db_saving.get_or_save_series(imdb_id)
+    # then
+    assert not Series.objects.filter(id=interrupted.id).exists(), "Interrupted import must be removed"
+    assert series.seasons.count() == 2, "Series must be imported again"
+    assert len(SeriesDetail.objects.get(series=series).seasons) == 2, "Detail document must hold all seasons"
+
+
+def test_retry_failed_downloads_saves_failed_seasons_and_episodes(mocker, settings, django_capture_on_commit_callbacks):
+    # given
+    settings.INGESTION_RETRY_ATTEMPTS = 2
+    imdb_id = "tt6666666"
+    failed_episode = {"imdbID": "tt6666667", "Episode": "10"}
+    still_failed_episode = {"imdbID": "tt6666668", "Episode": "11"}
+    mocker.patch("watchlists.services.db_saving.req.get_omdb_by_omdbid", return_value=make_series_data(imdb_id, 3))
+    mocker.patch(
+        "watchlists.services.db_saving.ingestion.iter_seasons",
+        return_value=[make_season_download(1, 10), (2, None, None), make_season_download(3, 9, [failed_episode, still_failed_episode])]
+    )
+    retry = mocker.patch("watchlists.tasks.retry_failed_downloads.apply_async")
+    with django_capture_on_commit_callbacks(execute=True):
+        series = db_saving.save_series(imdb_id)
+    series_id, failed_seasons, failed_episodes, attempt = retry.call_args.args[0]
+    mocker.patch("watchlists.services.db_saving.ingestion.iter_seasons", return_value=[make_season_download(2, 10)])
+    _, _, downloaded = make_season_download(3, 10)
+    mocker.patch(
+        "watchlists.services.db_saving.ingestion.fetch_episodes",
+        return_value=FetchResult(records=downloaded.records[9:], failed=[still_failed_episode])
+    )
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        retry_failed_downloads(series_id, failed_seasons, failed_episodes, attempt)
+    # then
+    assert series.seasons.count() == 3, "Failed season must be saved"
+    assert series.seasons.get(season_numb=3).total_episodes == 10, "Failed episode must be added to its season"
+    assert Episode.objects.filter(season__series=series).count() == 30, "Downloaded episodes must be saved"
+    assert len(SeriesDetail.objects.get(series=series).seasons) == 3, "Detail document must be rebuilt"
+    assert retry.call_args.args[0] == (series_id, [], [[3, [still_failed_episode]]], 2), "Episodes failed again must be retried"
@@ -1,8 +1,11 @@
 import os
 
 import requests
+from django.core.cache import cache
 from django.urls import reverse
 
+from watchlists.services import omdb_requests
+
 
 BASE_OMDB_URL = f"https://www.omdbapi.com?apikey={os.environ.get('API_KEY')}"
 
@@ -72,6 +75,19 @@ def test_get_with_search_and_year_and_page_query_params(api_client):
     assert response.status_code == 200, "Status code of response must be 200"
 
 
+def test_get_repeated_search_is_served_from_cache(api_client, mocker):
+    # given
+    search = "Some Cached Title"
+    cache.delete(omdb_requests.get_cache_key("search", {"s": search, "page": 1}))
+    omdb_get = mocker.patch("watchlists.services.omdb_client.omdb_client.get", return_value={"Response": "True", "Search": []})
+    # when
+    first_response = api_client.get(reverse("watchlists_app:search"), {"search": search})
+    second_response = api_client.get(reverse("watchlists_app:search"), {"search": f"  {search.upper()} ", "page": 1})
+    # then
+    assert omdb_get.call_count == 1, "Repeated normalized search must not reach OMDb"
+    assert first_response.json() == second_response.json(), "The cached response must be equal to the first one"
+
+
 def test_post(api_client):
     # when
     response = api_client.post(reverse("watchlists_app:search"))
@@ -9,5 +9,7 @@ urlpatterns = [
     path('search/', views.search_by_search_view, name='search'),
     path('recently_searched/', views.RecentlySearched.as_view(), name='recently_searched'),
     path('get/', views.GetByOmdbIdView.as_view(),  name='get_by_omdbid'),
-    path('get/season/', views.GetSeason.as_view(), name='get_season_by_omdbid')
+    path('get/season/', views.GetSeason.as_view(), name='get_season_by_omdbid'),
+    path('get/status/<str:job_id>/', views.ImportStatusView.as_view(), name='import_status'),
+    path('omdb/budget/', views.OmdbBudgetView.as_view(), name='omdb_budget'),
 ]
@@ -1,14 +1,23 @@
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.http import Http404
+from django.urls import reverse
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
+from rest_framework import status
 from rest_framework.generics import RetrieveAPIView, ListAPIView
 from rest_framework.decorators import api_view
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from watchlists.models import Media, Movie, Series
+from base.cache import versioned_cache_page, get_media_tag
+from watchlists.models import Media, Series, Season, Episode
 from watchlists.serializers import MovieSerializer, SeriesSerializer, SeasonSerializer, MediaSerializer
-from watchlists.services import omdb_requests, db_saving
+from watchlists.services import omdb_requests, db_saving, rate_limiter
+from watchlists.tasks import get_import_job_id, get_import_marker_key, import_series
 from watchlists.utills import validate_imdb_rating
 
 
@@ -23,31 +32,45 @@ def search_by_search_view(request):
     return Response(search_results)
 
 
+def get_media_tags(request, *args, **kwargs):
+    return [get_media_tag(request.GET.get('imdb_id'))]
+
+
 class GetByOmdbIdView(RetrieveAPIView):
 
-    @method_decorator(cache_page(60*60*24*90, key_prefix='get_media_view'))
+    @method_decorator(versioned_cache_page(60*60*24*90, namespace='get_media_view', get_tags=get_media_tags))
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
-    def get_object(self):
+    def retrieve(self, request, *args, **kwargs):
+        type, imdb_id = self.get_lookup()
+        if type == 'series' and settings.SERIES_IMPORT_IN_BACKGROUND:
+            if not Series.objects.filter(imdb_id=imdb_id, detail__isnull=False).exists():
+                job_id = get_import_job_id(imdb_id)
+                # SET NX, polling clients must not enqueue the job again while it is queued or running
+                if cache.add(get_import_marker_key(job_id), 1, timeout=settings.IMPORT_JOB_TIMEOUT):
+                    # job id is the same for every run, FAILURE of the previous one must not be reported for the new one
+                    AsyncResult(job_id).forget()
+                    import_series.apply_async((imdb_id,), task_id=job_id)
+                return Response(
+                    {'job_id': job_id, 'status': reverse('watchlists_app:import_status', args=(job_id,))},
+                    status=status.HTTP_202_ACCEPTED
+                )
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_lookup(self):
         type = self.request.query_params.get('type')
         imdb_id = self.request.query_params.get('imdb_id')
         if not all([type, imdb_id]):
             raise Http404
+        return type, imdb_id
+
+    def get_object(self):
+        type, imdb_id = self.get_lookup()
         if type == 'movie':
-            try:
-                movie = Movie.objects.get(imdb_id=imdb_id)
-            except Movie.DoesNotExist:
-                movie = db_saving.save_movie(imdb_id)
-                movie.save()
-            return movie
+            return db_saving.get_or_save_movie(imdb_id)
         elif type == 'series':
-            try:
-                series = Series.objects.prefetch_related('seasons__episodes').get(imdb_id=imdb_id)
-            except Series.DoesNotExist:
-                series = db_saving.save_series(imdb_id)
-                series.save()
-            return series
+            return db_saving.get_or_save_series(imdb_id)
         raise Http404
 
     def get_serializer_class(self):
@@ -65,26 +88,64 @@ class GetByOmdbIdView(RetrieveAPIView):
         return context
 
 
+class ImportStatusView(APIView):
+    """
+    Progress of background series import,
+    returns serialized series once it is done.
+    """
+
+    def get(self, request, job_id):
+        result = AsyncResult(job_id)
+        if result.state == 'SUCCESS':
+            series = Series.objects.select_related('detail').get(id=result.result['id'])
+            context = {
+                'request': request,
+                'imdb_rating': validate_imdb_rating(request.query_params.get('imdb_rating', None)),
+            }
+            return Response({'status': result.state, 'media': SeriesSerializer(series, context=context).data})
+        if result.state == 'FAILURE':
+            return Response(
+                {'status': result.state, 'detail': 'Import failed, please try again.'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        # unknown and expired jobs are reported as PENDING by Celery
+        if result.state == 'PENDING' and not cache.get(get_import_marker_key(job_id)):
+            raise Http404
+
+        progress = result.info if result.state == 'PROGRESS' else {'seasons': 0, 'episodes': 0}
+        return Response({'status': result.state, 'progress': progress}, status=status.HTTP_202_ACCEPTED)
+
+
+class OmdbBudgetView(APIView):
+    """
+    Remaining OMDb request budget shared by web and Celery workers.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(rate_limiter.get_budget())
+
+
 class GetSeason(RetrieveAPIView):
     serializer_class = SeasonSerializer
 
     def get_object(self):
         imdb_id = self.request.query_params.get('imdb_id')
         season_number = self.request.query_params.get('season')
-        if not all([imdb_id, season_number]):
+        if not all([imdb_id, season_number]) or not season_number.isdigit():
             raise Http404
-        try:
-            series = Series.objects.get(imdb_id=imdb_id)
-        except Series.DoesNotExist:
+        imdb_rating = validate_imdb_rating(self.request.query_params.get('imdb_rating', None))
+        episodes = Episode.objects.all()
+        if imdb_rating:
+            episodes = episodes.filter(imdb_rating__gte=imdb_rating)
+        season = Season.objects \
+            .filter(series__imdb_id=imdb_id, series__media_type=Media.MediaTypes.SERIES, season_numb=season_number) \
+            .prefetch_related(Prefetch('episodes', queryset=episodes)) \
+            .first()
+        if season is None:
             raise Http404
-        season = series.seasons.get(season_numb=season_number)
         return season
 
-    def get_serializer_context(self):
-        context = {}
-        context['imdb_rating'] = self.request.query_params.get('imdb_rating', None)
-        return context
-
 
 class RecentlySearched(ListAPIView):
     queryset = Media.objects.order_by('-last_retrieved')